@@ -0,0 +1,48 @@
+import os
+import sys
+
+import numpy as np
+import matplotlib.pyplot as plt
+from tqdm import tqdm
+
+from mandelbrot.mandelbrot import ITERS
+from mandelbrot.buddhabrot import Buddhabrot
+
+
+if __name__ == '__main__':
+
+  USAGE = 'USAGE: python buddhabrot_render.py <n> <N> <max_iter> <n_runs> [--anti]'
+  args = [a for a in sys.argv[1:] if not a.startswith('--')]
+  flags = [a for a in sys.argv[1:] if a.startswith('--')]
+  assert len(args) == 4, USAGE
+  assert set(flags) <= {'--anti'}, USAGE
+
+  n = int(args[0])
+  N = int(args[1])
+  max_iter = int(args[2])
+  n_runs = int(args[3])
+  anti = '--anti' in flags
+  re_lim, im_lim, _ = ITERS[n]
+
+  # Samples per chain between checkpoints
+  n_steps = 100000
+
+  outdir = './out/'
+  os.makedirs(outdir, exist_ok=True)
+  fname = outdir + '{0}_{1}_re_{2}_{3}_im_{4}_{5}_maxiter_{6}_N_{7}'.format(
+            'antibuddhabrot' if anti else 'buddhabrot', n, *re_lim, *im_lim,
+            max_iter, N)
+
+  # Long renders resume from the last checkpoint
+  if os.path.exists(fname + '.npz'):
+    sampler = Buddhabrot.load(fname + '.npz')
+  else:
+    sampler = Buddhabrot(re_lim, im_lim, N, N, max_iter, anti=anti)
+
+  for _ in tqdm(range(n_runs)):
+    sampler.run(n_steps).save(fname + '.npz')
+  print(sampler.stats())
+
+  density = sampler.density()
+  plt.imsave(fname + '.png', np.sqrt(density / max(density.max(), 1e-300)),
+             cmap='inferno')
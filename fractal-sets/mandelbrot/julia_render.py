@@ -0,0 +1,26 @@
+import os
+import sys
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from mandelbrot.julia import julia_atlas
+
+
+if __name__ == '__main__':
+
+  USAGE = 'USAGE: python julia_render.py <n_c> <thumb> <max_iter>'
+  assert len(sys.argv) == 4, USAGE
+
+  n_c = int(sys.argv[1])
+  thumb = int(sys.argv[2])
+  max_iter = int(sys.argv[3])
+  re_lim, im_lim = (-2, 0.5), (-1.25, 1.25)
+
+  outdir = './out/'
+  os.makedirs(outdir, exist_ok=True)
+  fname = outdir + 'julia_atlas_re_{0}_{1}_im_{2}_{3}_nc_{4}_thumb_{5}_maxiter_{6}'.format(
+            *re_lim, *im_lim, n_c, thumb, max_iter)
+
+  atlas, _ = julia_atlas(re_lim, im_lim, n_c, n_c, thumb, max_iter)
+  plt.imsave(fname + '.png', np.log1p(atlas), cmap='inferno')
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from mandelbrot.logistic import bifurcation, bifurcation_image
+
+
+if __name__ == '__main__':
+
+  USAGE = 'USAGE: python logistic_render.py <width> <height> <samples> [--lyapunov]'
+  args = [a for a in sys.argv[1:] if not a.startswith('--')]
+  flags = [a for a in sys.argv[1:] if a.startswith('--')]
+  assert len(args) == 3, USAGE
+  assert set(flags) <= {'--lyapunov'}, USAGE
+
+  width = int(args[0])
+  height = int(args[1])
+  samples = int(args[2])
+  r_lim = (2.5, 4)
+
+  outdir = './out/'
+  os.makedirs(outdir, exist_ok=True)
+  fname = outdir + 'logistic_r_{0}_{1}_{2}x{3}_s{4}'.format(*r_lim, width, height, samples)
+
+  density, r, lyap = bifurcation(r_lim, width, height, samples,
+                                 lyapunov='--lyapunov' in flags)
+  plt.imsave(fname + '.png', bifurcation_image(density))
+  if lyap is not None:
+    np.save(fname + '.lyap.npy', np.stack((r, lyap)))
@@ -0,0 +1,12 @@
+'''
+Mandelbrot set and related escape-time fractals, compiled with numba.
+'''
+import importlib
+
+_submodules = ('mandelbrot', 'perturbation', 'color', 'zoom', 'logistic',
+               'julia', 'buddhabrot')
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
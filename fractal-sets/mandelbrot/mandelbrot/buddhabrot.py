@@ -0,0 +1,302 @@
+'''
+Orbit densities of the Mandelbrot set (Buddhabrot and Anti-Buddhabrot).
+
+The density of a view is the number of points of the orbits of every c
+landing in its pixels, integrated over c. Sampling c uniformly wastes
+almost every sample in zoomed views, whose pixels are reached by the
+orbits of few values of c. Instead, every chain of samples is a random
+walk (Metropolis-Hastings) with a stationary distribution proportional
+to the number of points h(c) of the orbit of c inside the view. The
+orbit of every sample is added with the weight 1/h(c), which keeps the
+estimate of the density unbiased. The walk mixes small steps, which
+explore the values of c around a contributing one, with uniform jumps,
+which keep it from getting stuck, and from which the normalisation of
+the density is estimated.
+
+The chains run in parallel, each with its own histogram, random number
+generator and state, which are saved into checkpoints between runs.
+'''
+import os
+
+import numpy as np
+from numba import njit, prange, get_num_threads
+
+from .mandelbrot import escape_orbit
+
+
+# Sampled values of c are in [-2, 2] x [-2, 2]
+C_LIM = 2.0
+
+
+#######
+#
+#    RANDOM NUMBERS
+#
+##########################################################################
+
+@njit(inline='always')
+def xorshift(state, k):
+    '''
+    Advance the xorshift64* generator `state[k]`, and get a uniform
+    random number in [0, 1).
+    '''
+    x = state[k]
+    x ^= x >> np.uint64(12)
+    x ^= x << np.uint64(25)
+    x ^= x >> np.uint64(27)
+    state[k] = x
+    x *= np.uint64(0x2545F4914F6CDD1D)
+    return (x >> np.uint64(11)) * (1.0 / 2**53)
+
+@njit(inline='always')
+def gauss(state, k):
+    '''
+    Get a standard normal random number (Box-Muller).
+    '''
+    u = 1.0 - xorshift(state, k)
+    return np.sqrt(-2 * np.log(u)) * np.cos(2 * np.pi * xorshift(state, k))
+
+
+#######
+#
+#    ORBITS
+#
+##########################################################################
+
+@njit(inline='always')
+def orbit_length(cr, ci, max_iter, min_iter, anti):
+    '''
+    Get the number of points of the orbit of c which are accumulated,
+    i.e. the points before the escape of the orbits escaping after at
+    least `min_iter` iterations, or `max_iter` points of the orbits not
+    escaping when `anti` is set. Other values of c get 0.
+    '''
+    n, _ = escape_orbit(cr, ci, max_iter)
+    if anti:
+        return max_iter if n < 0 else 0
+    return n if n >= min_iter else 0
+
+@njit(inline='always')
+def orbit_hits(cr, ci, n, re0, im1, sx, sy, hist, weight):
+    '''
+    Count the first n points of the orbit of c, starting from c, which
+    are inside the view of the histogram `hist`, with its upper left
+    corner at `re0 + 1j*im1` and `sx` and `sy` pixels per unit. The
+    points are added to `hist` with `weight`, unless it is 0.
+    '''
+    h, w = hist.shape
+    zr, zi = cr, ci
+    hits = 0
+    for _ in range(n):
+        col = int((zr - re0) * sx)
+        row = int((im1 - zi) * sy)
+        if (0 <= row < h) and (0 <= col < w) and (zr >= re0) and (zi <= im1):
+            hits += 1
+            if weight:
+                hist[row,col] += weight
+        zr, zi = zr*zr - zi*zi + cr, 2*zr*zi + ci
+    return hits
+
+@njit(inline='always')
+def contribution(cr, ci, max_iter, min_iter, anti, re0, im1, sx, sy, hist):
+    '''
+    Get the accumulated length and the number of points inside the view
+    h(c) of the orbit of c.
+    '''
+    if abs(cr) > C_LIM or abs(ci) > C_LIM:
+        return 0, 0
+    n = orbit_length(cr, ci, max_iter, min_iter, anti)
+    if n == 0:
+        return 0, 0
+    return n, orbit_hits(cr, ci, n, re0, im1, sx, sy, hist, 0.0)
+
+@njit(parallel=True, nogil=True)
+def metropolis_block(n_steps, max_iter, min_iter, anti, re0, im1, sx, sy,
+                     sigma, p_uniform, rng, c, n_c, h_c, hist, counts):
+    '''
+    Advance every chain by `n_steps` samples of the Metropolis-Hastings
+    walk, in parallel over the chains.
+
+    The state of chain k is the random number generator `rng[k]`, the
+    current sample `c[k]` with the accumulated orbit length `n_c[k]` and
+    `h_c[k]` points in the view, and its histogram `hist[k]`. The
+    numbers of steps, uniform jumps, accepted proposals, proposals with
+    h > 0, the sum of h over the uniform jumps and the number of samples
+    added to the histogram are added to `counts[k]`. Chains only take
+    small steps and add samples once they have reached a value of c
+    with h > 0.
+    '''
+    for k in prange(c.shape[0]):
+        cr, ci = c[k,0], c[k,1]
+        n, hits = n_c[k], h_c[k]
+        for _ in range(n_steps):
+            # Chains search with uniform jumps until h > 0
+            uniform = hits == 0 or xorshift(rng, k) < p_uniform
+            if uniform:
+                pr = C_LIM * (2*xorshift(rng, k) - 1)
+                pi = C_LIM * (2*xorshift(rng, k) - 1)
+            else:
+                pr = cr + sigma * gauss(rng, k)
+                pi = ci + sigma * gauss(rng, k)
+            pn, ph = contribution(pr, pi, max_iter, min_iter, anti,
+                                  re0, im1, sx, sy, hist[k])
+            counts[k,0] += 1
+            if uniform:
+                counts[k,1] += 1
+                counts[k,4] += ph
+            if ph > 0:
+                counts[k,3] += 1
+            # Both proposals are symmetric, so the acceptance only
+            # depends on the ratio of the target densities
+            if ph > 0 and (hits == 0 or xorshift(rng, k) * hits < ph):
+                cr, ci, n, hits = pr, pi, pn, ph
+                counts[k,2] += 1
+            if hits > 0:
+                counts[k,5] += 1
+                orbit_hits(cr, ci, n, re0, im1, sx, sy, hist[k], 1.0 / hits)
+        c[k,0], c[k,1] = cr, ci
+        n_c[k], h_c[k] = n, hits
+    return hist
+
+
+#######
+#
+#    SAMPLER
+#
+##########################################################################
+
+class Buddhabrot():
+
+    _counts = ('steps', 'uniform', 'accepted', 'useful', 'uniform_hits',
+               'samples')
+
+    def __init__(self, re_lim, im_lim, width, height, max_iter, min_iter=0,
+                 anti=False, n_chains=None, seed=0, p_uniform=0.1,
+                 mutate=0.01):
+        '''
+        Initialize the parallel Metropolis-Hastings sampler of the orbit
+        density of a view, which is advanced by `run` and can be saved
+        into a checkpoint and resumed.
+
+        Parameters:
+        -----------
+        re_lim, im_lim : tuple
+            Limits of the view along the real and imaginary axes.
+        width, height : int
+            Number of pixels along the real and imaginary axes.
+        max_iter : int
+            Maximum number of iterations.
+        min_iter : int
+            Minimum number of iterations of the escaping orbits which
+            are accumulated.
+        anti : bool
+            Accumulate the orbits that do not escape in `max_iter`
+            iterations instead (Anti-Buddhabrot).
+        n_chains : int, optional
+            Number of independent chains, each with its own histogram.
+            Defaults to the number of numba threads.
+        seed : int
+            Seed of the random number generators of the chains.
+        p_uniform : float
+            Probability of a uniform jump in [-2, 2] x [-2, 2] instead
+            of a small step.
+        mutate : float
+            Standard deviation of the small steps in units of the larger
+            side of the view.
+        '''
+        self.re_lim = tuple(re_lim)
+        self.im_lim = tuple(im_lim)
+        self.max_iter = max_iter
+        self.min_iter = min_iter
+        self.anti = anti
+        self.p_uniform = p_uniform
+        self.sigma = mutate * max(re_lim[1] - re_lim[0], im_lim[1] - im_lim[0])
+
+        n_chains = n_chains or get_num_threads()
+        seeds = np.random.SeedSequence(seed).generate_state(n_chains, np.uint64)
+        self.rng = seeds | np.uint64(1)
+        self.c = np.zeros((n_chains, 2))
+        self.n_c = np.zeros(n_chains, dtype=np.int64)
+        self.h_c = np.zeros(n_chains, dtype=np.int64)
+        self.hist = np.zeros((n_chains, height, width))
+        self.counts = np.zeros((n_chains, len(self._counts)), dtype=np.int64)
+
+    def _view(self):
+        h, w = self.hist.shape[1:]
+        (re0, re1), (im0, im1) = self.re_lim, self.im_lim
+        return re0, im1, w / (re1 - re0), h / (im1 - im0)
+
+    def run(self, n_steps):
+        '''
+        Advance every chain by `n_steps` samples. Chains start from the
+        first uniform jump with an orbit inside the view.
+        '''
+        metropolis_block(n_steps, self.max_iter, self.min_iter, self.anti,
+                         *self._view(), self.sigma, self.p_uniform,
+                         self.rng, self.c, self.n_c, self.h_c, self.hist,
+                         self.counts)
+        return self
+
+    def stats(self):
+        '''
+        Get the counts of the samples summed over the chains, and the
+        acceptance rate and the fraction of useful proposals, i.e. the
+        ones with orbits inside the view.
+        '''
+        stats = dict(zip(self._counts, self.counts.sum(axis=0).tolist()))
+        steps = max(stats['steps'], 1)
+        stats['acceptance'] = stats['accepted'] / steps
+        stats['useful_fraction'] = stats['useful'] / steps
+        return stats
+
+    def density(self):
+        '''
+        Merge the histograms of the chains into the estimate of the
+        orbit density.
+
+        Returns
+        -------
+        np.ndarray
+            Expected number of orbit points in every pixel per value of
+            c sampled uniformly in [-2, 2] x [-2, 2], of shape
+            `(height, width)` with the first row corresponding to the
+            upper limit of `im_lim`. The normalisation is estimated from
+            the uniform jumps, so it is noisy in deep zooms, where few
+            of them reach the view, while the relative density is not
+            affected.
+        '''
+        uniform, samples = self.counts[:,1].sum(), self.counts[:,5].sum()
+        if uniform == 0 or samples == 0:
+            return np.zeros(self.hist.shape[1:])
+        mean_hits = self.counts[:,4].sum() / uniform
+        return self.hist.sum(axis=0) * (mean_hits / samples)
+
+    def save(self, fname):
+        '''
+        Save the state of the sampler into a `.npz` checkpoint. The file
+        is replaced atomically, so an interrupted save keeps the
+        previous checkpoint.
+        '''
+        tmp = fname + '.tmp.npz'
+        np.savez(tmp, re_lim=self.re_lim, im_lim=self.im_lim,
+                 params=(self.max_iter, self.min_iter, self.anti),
+                 p_uniform=self.p_uniform, sigma=self.sigma, rng=self.rng,
+                 c=self.c, n_c=self.n_c, h_c=self.h_c, hist=self.hist,
+                 counts=self.counts)
+        os.replace(tmp, fname)
+
+    @classmethod
+    def load(cls, fname):
+        '''
+        Resume a sampler from a checkpoint written by `save`.
+        '''
+        with np.load(fname) as f:
+            max_iter, min_iter, anti = f['params'].tolist()
+            n_chains, height, width = f['hist'].shape
+            self = cls(f['re_lim'], f['im_lim'], width, height, max_iter,
+                       min_iter, bool(anti), n_chains,
+                       p_uniform=float(f['p_uniform']))
+            self.sigma = float(f['sigma'])
+            for name in ('rng', 'c', 'n_c', 'h_c', 'hist', 'counts'):
+                setattr(self, name, f[name].copy())
+        return self
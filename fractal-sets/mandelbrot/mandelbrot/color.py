@@ -0,0 +1,211 @@
+'''
+Smooth escape times and histogram-equalised colouring.
+
+The normalised iteration count
+
+    nu = n + 1 - log2(log|z_n|),
+
+where z_n is the first point of the orbit outside a large bailout
+radius, is continuous across the bands of the integer escape times. The
+histogram of nu is accumulated in the same parallel pass, and its
+cumulative distribution maps nu to the index of a uint8 lookup table,
+which spreads the colors evenly over the pixels at any `max_iter`.
+'''
+import numpy as np
+from numba import njit, prange, get_num_threads
+
+from .mandelbrot import escape_orbit, mandelbrot_axes
+
+
+# Large bailout radius (2^8) for the smooth count to be accurate
+BAILOUT2 = 2.0**16
+
+
+#######
+#
+#    SMOOTH ESCAPE TIME
+#
+##########################################################################
+
+@njit
+def smooth_escape_time(cr, ci, max_iter):
+    '''
+    Get the normalised iteration count of c, or NaN for the points that
+    do not escape in `max_iter` iterations.
+    '''
+    n, z2 = escape_orbit(cr, ci, max_iter, BAILOUT2)
+    if n < 0:
+        return np.nan
+    # log|z| = log(|z|^2) / 2
+    nu = n + 1 - np.log2(0.5 * np.log(z2))
+    return min(max(nu, 0.0), max_iter)
+
+@njit(parallel=True, nogil=True)
+def smooth_block(re, im, max_iter, out, hist):
+    '''
+    Fill `out[i,j]` with the normalised iteration count of
+    `re[j] + 1j*im[i]`, and add the escaped points to `hist`, which has
+    a bin for every unit of nu. The rows are processed in parallel in
+    chunks, each with its own histogram.
+    '''
+    n_chunks = min(im.size, 4 * get_num_threads())
+    hists = np.zeros((n_chunks, hist.size), dtype=np.int64)
+    for k in prange(n_chunks):
+        for i in range(k, im.size, n_chunks):
+            for j in range(re.size):
+                nu = smooth_escape_time(re[j], im[i], max_iter)
+                out[i,j] = nu
+                if not np.isnan(nu):
+                    hists[k,min(int(nu), hist.size - 1)] += 1
+    for k in range(n_chunks):
+        hist += hists[k]
+    return out, hist
+
+def mandelbrot_smooth(re_lim, im_lim, max_iter, width, height, out=None,
+                      hist=None):
+    '''
+    Compute the normalised iteration count of every pixel of a view of
+    the Mandelbrot set, and its histogram.
+
+    Parameters
+    ----------
+    re_lim, im_lim, max_iter, width, height :
+        See `mandelbrot.mandelbrot_set`.
+    out : np.ndarray, optional
+        Array of shape `(height, width)` to write the counts into. It
+        defaults to a new float32 array.
+    hist : np.ndarray, optional
+        Histogram of `max_iter + 1` int64 bins to add the counts to.
+
+    Returns
+    -------
+    nu : np.ndarray
+        The normalised iteration counts, with NaN for the points of the
+        set.
+    hist : np.ndarray
+        The histogram of the counts of the escaped points.
+    '''
+    if out is None:
+        out = np.empty((height, width), dtype=np.float32)
+    if hist is None:
+        hist = np.zeros(max_iter + 1, dtype=np.int64)
+    re, im = mandelbrot_axes(re_lim, im_lim, width, height)
+    return smooth_block(re, im, max_iter, out, hist)
+
+
+#######
+#
+#    HISTOGRAM EQUALISATION
+#
+##########################################################################
+
+def get_cmap(cmap):
+    '''
+    Look up a colormap by name, importing matplotlib only then.
+    '''
+    if isinstance(cmap, str):
+        from matplotlib import colormaps
+        return colormaps[cmap]
+    return cmap
+
+def smooth_palette(cmap='inferno', n_colors=256, interior=(0,0,0,255)):
+    '''
+    Get the uint8 RGBA lookup table of the colouring.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape `(n_colors + 1, 4)`, with the color of the points
+        of the set last.
+    '''
+    lut = np.empty((n_colors + 1, 4), dtype=np.uint8)
+    lut[:-1] = get_cmap(cmap)(np.linspace(0, 1, n_colors), bytes=True)
+    lut[-1] = interior
+    return lut
+
+def equalize(hist):
+    '''
+    Get the cumulative distribution of the counts at the edges of the
+    bins of their histogram, normalised to [0, 1].
+    '''
+    cdf = np.zeros(hist.size + 1)
+    np.cumsum(hist, out=cdf[1:])
+    return cdf / max(cdf[-1], 1)
+
+def smooth_colors(nu, cdf, lut):
+    '''
+    Color normalised iteration counts through the cumulative
+    distribution of their histogram and a lookup table generated by
+    `smooth_palette`.
+
+    Returns
+    -------
+    np.ndarray
+        uint8 RGBA image of shape `(*nu.shape, 4)`.
+    '''
+    n_colors = lut.shape[0] - 1
+    t = np.interp(nu, np.arange(cdf.size), cdf)
+    interior = np.isnan(t)
+    t[interior] = 0
+    idx = np.minimum(t * n_colors, n_colors - 1).astype(np.intp)
+    idx[interior] = n_colors
+    return np.take(lut, idx, axis=0)
+
+def mandelbrot_image(re_lim, im_lim, max_iter, width, height, cmap='inferno'):
+    '''
+    Render a view of the Mandelbrot set into a uint8 RGBA image with
+    smooth, histogram-equalised colors.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape `(height, width, 4)` with the first row
+        corresponding to the upper limit of `im_lim`.
+    '''
+    nu, hist = mandelbrot_smooth(re_lim, im_lim, max_iter, width, height)
+    return smooth_colors(nu, equalize(hist), smooth_palette(cmap))
+
+def mandelbrot_image_tiled(re_lim, im_lim, max_iter, width, height, fname,
+                           tile=1024, cmap='inferno'):
+    '''
+    Render a view of the Mandelbrot set tile by tile into a
+    memory-mapped uint8 RGBA image. The counts of the tiles are kept in
+    a memory-mapped float32 array next to it until the histogram of the
+    whole view is complete, then colored tile by tile. The result is
+    identical to the one of `mandelbrot_image`.
+
+    Parameters
+    ----------
+    re_lim, im_lim, max_iter, width, height :
+        See `mandelbrot.mandelbrot_set`.
+    fname : str
+        Path of the `.npy` file to write the image into. The counts are
+        written into the file with `.nu` inserted before the extension.
+    tile : int, default=1024
+        Size of the square tiles the view is rendered in.
+    cmap : str or `~matplotlib.colors.Colormap`, default 'inferno'
+        Colormap of the image.
+
+    Returns
+    -------
+    np.memmap
+        Memory-mapped array of shape `(height, width, 4)` backed by `fname`.
+    '''
+    re, im = mandelbrot_axes(re_lim, im_lim, width, height)
+    nu = np.lib.format.open_memmap(fname[:-4] + '.nu.npy', mode='w+',
+                                   dtype=np.float32, shape=(height, width))
+    img = np.lib.format.open_memmap(fname, mode='w+', dtype=np.uint8,
+                                    shape=(height, width, 4))
+    tiles = [(slice(r, r+tile), slice(c, c+tile))
+             for r in range(0, height, tile) for c in range(0, width, tile)]
+
+    hist = np.zeros(max_iter + 1, dtype=np.int64)
+    for rows, cols in tiles:
+        smooth_block(re[cols], im[rows], max_iter, nu[rows,cols], hist)
+
+    cdf, lut = equalize(hist), smooth_palette(cmap)
+    for rows, cols in tiles:
+        img[rows,cols] = smooth_colors(nu[rows,cols], cdf, lut)
+    img.flush()
+
+    return img
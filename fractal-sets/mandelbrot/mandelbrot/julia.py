@@ -0,0 +1,150 @@
+'''
+Julia sets of z -> z^2 + c, and atlases of Julia sets over a grid of c.
+
+The Julia sets share the escape-time kernel of the Mandelbrot set, with
+the orbit started from the pixel instead of from c. An atlas renders a
+thumbnail of the Julia set of every c of a grid in a single parallel
+pass, into one preallocated array.
+'''
+import numpy as np
+from numba import njit, prange, get_num_threads
+
+from .mandelbrot import escape_orbit, iterate_orbit, iter_dtype, mandelbrot_axes
+
+
+#######
+#
+#    ESCAPE-TIME KERNEL
+#
+##########################################################################
+
+@njit(inline='always')
+def julia_bailout2(cr, ci):
+    '''
+    Get the square of the escape radius max(2, |c|) of the Julia set
+    of c.
+    '''
+    return max(4.0, cr*cr + ci*ci)
+
+@njit(nogil=True)
+def julia_block(re, im, cr, ci, max_iter, out):
+    '''
+    Fill `out[i,j]` with the escape time of `re[j] + 1j*im[i]` under
+    z -> z^2 + c, or 0 for points that do not escape in `max_iter`
+    iterations.
+    '''
+    bailout2 = julia_bailout2(cr, ci)
+    for i in range(im.size):
+        for j in range(re.size):
+            n, _ = iterate_orbit(re[j], im[i], cr, ci, max_iter, bailout2)
+            out[i,j] = max(n, 0)
+    return out
+
+@njit(parallel=True, nogil=True)
+def julia_atlas_block(c_re, c_im, re, im, max_iter, dust_iter, out, connected):
+    '''
+    Fill the atlas `out` of shape `(c_im.size * im.size, c_re.size * re.size)`
+    with the Julia sets of `c_re[l] + 1j*c_im[k]` on the grid of `re` and
+    `im`, with the first row of thumbnails corresponding to `c_im[0]`.
+
+    When c escapes from the Mandelbrot set in n iterations, its Julia
+    set is a Cantor dust, which has no interior and no attracting cycles
+    to detect. These thumbnails are iterated at most n + `dust_iter`
+    times, as the pixels near the dust escape a few iterations after
+    the critical orbit. `connected[k,l]` is set to whether c is in the
+    Mandelbrot set.
+
+    The values of c are processed in parallel in interleaved chunks, so
+    the slow, connected sets are spread between the threads.
+    '''
+    n_c = c_im.size * c_re.size
+    h, w = im.size, re.size
+    n_chunks = min(n_c, 4 * get_num_threads())
+    for chunk in prange(n_chunks):
+        for idx in range(chunk, n_c, n_chunks):
+            k, l = idx // c_re.size, idx % c_re.size
+            cr, ci = c_re[l], c_im[k]
+
+            n, _ = escape_orbit(cr, ci, max_iter)
+            connected[k,l] = n < 0
+            m = max_iter if n < 0 else min(max_iter, n + dust_iter)
+            julia_block(re, im, cr, ci, m,
+                        out[k*h:(k+1)*h, l*w:(l+1)*w])
+    return out, connected
+
+
+#######
+#
+#    RENDERING
+#
+##########################################################################
+
+def julia_set(c, re_lim, im_lim, max_iter, width, height, out=None):
+    '''
+    Compute the escape time of every pixel of a view of the Julia set
+    of c.
+
+    Parameters
+    ----------
+    c : complex
+        Parameter of the Julia set.
+    re_lim, im_lim, max_iter, width, height, out :
+        See `mandelbrot.mandelbrot_set`.
+
+    Returns
+    -------
+    np.ndarray
+        Escape times of shape `(height, width)`, with the first row
+        corresponding to the upper limit of `im_lim`. Points of the
+        filled Julia set have 0.
+    '''
+    if out is None:
+        out = np.empty((height, width), dtype=iter_dtype(max_iter))
+    re, im = mandelbrot_axes(re_lim, im_lim, width, height)
+    return julia_block(re, im, c.real, c.imag, max_iter, out)
+
+def julia_atlas(re_lim, im_lim, n_re, n_im, thumb, max_iter, z_radius=2.0,
+                dust_iter=64, out=None):
+    '''
+    Render an atlas of the Julia sets of a grid of c values, with every
+    thumbnail placed at its c in the plane of the Mandelbrot set.
+
+    Parameters
+    ----------
+    re_lim, im_lim : tuple
+        Limits of the grid of c along the real and imaginary axes.
+    n_re, n_im : int
+        Number of values of c along the real and imaginary axes.
+    thumb : int
+        Size of the square thumbnails in pixels.
+    max_iter : int
+        Maximum number of iterations.
+    z_radius : float, default=2.0
+        Half of the size of the square view of the thumbnails, centered
+        at the origin.
+    dust_iter : int, default=64
+        Number of iterations spent on the Julia sets of the values of c
+        outside the Mandelbrot set after their critical orbit escapes.
+    out : np.ndarray, optional
+        Array of shape `(n_im * thumb, n_re * thumb)` to write the atlas
+        into. It defaults to a new array of `iter_dtype(max_iter)`.
+
+    Returns
+    -------
+    atlas : np.ndarray
+        Escape times of shape `(n_im * thumb, n_re * thumb)`, with the
+        first row of thumbnails corresponding to the upper limit of
+        `im_lim`.
+    connected : np.ndarray
+        Boolean array of shape `(n_im, n_re)`, which is True for the
+        values of c inside the Mandelbrot set, whose Julia sets are
+        connected.
+    '''
+    if out is None:
+        out = np.empty((n_im * thumb, n_re * thumb), dtype=iter_dtype(max_iter))
+    c_re, c_im = mandelbrot_axes(re_lim, im_lim, n_re, n_im)
+    re, im = mandelbrot_axes((-z_radius, z_radius), (-z_radius, z_radius),
+                             thumb, thumb)
+    connected = np.empty((n_im, n_re), dtype=np.bool_)
+    return julia_atlas_block(c_re, c_im, re, im, max_iter, dust_iter,
+                             out, connected)
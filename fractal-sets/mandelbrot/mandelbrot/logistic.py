@@ -0,0 +1,129 @@
+'''
+Bifurcation diagram and Lyapunov exponents of the logistic map
+x -> r x (1 - x).
+'''
+import numpy as np
+from numba import njit, prange
+
+from .color import get_cmap
+
+
+@njit(inline='always')
+def logistic(r, x):
+    return r * x * (1 - x)
+
+def cobweb_path(r, x0, n):
+    '''
+    Get the vertices of the cobweb plot of n iterations from x0, to be
+    drawn with a single `plot` call.
+
+    Returns
+    -------
+    xs, ys : np.ndarray
+        Coordinates of the `2n + 1` vertices of the path, starting from
+        `(x0, x0)` on the diagonal.
+    '''
+    x = np.empty(n + 1)
+    x[0] = x0
+    for i in range(n):
+        x[i+1] = r * x[i] * (1 - x[i])
+    # (x_i, x_i) -> (x_i, x_{i+1}) -> (x_{i+1}, x_{i+1}) -> ...
+    xs = np.repeat(x, 2)[:-1]
+    ys = np.repeat(x, 2)[1:]
+    return xs, ys
+
+
+#######
+#
+#    BIFURCATION DIAGRAM
+#
+##########################################################################
+
+@njit(parallel=True, nogil=True)
+def bifurcation_block(r, x0, n_burn, n_iter, x_lim, hist, lyap):
+    '''
+    Iterate the logistic map for every value of `r`, and add the values
+    of x visited after the first `n_burn` iterations to the density
+    histogram `hist` of shape `(n_x, n_cols)`, with the first row at the
+    upper limit of `x_lim`. The values of `r` are split evenly between
+    the columns, which are processed in parallel. The mean of
+    log|r (1 - 2x)| over the same iterations, i.e. the Lyapunov
+    exponent, is written into `lyap`, if it is not empty.
+    '''
+    n_x, n_cols = hist.shape
+    per_col = r.size // n_cols
+    scale = n_x / (x_lim[1] - x_lim[0])
+    for col in prange(n_cols):
+        for k in range(col * per_col, (col + 1) * per_col):
+            rk, x = r[k], x0
+            for _ in range(n_burn):
+                x = logistic(rk, x)
+
+            s = 0.0
+            for _ in range(n_iter):
+                x = logistic(rk, x)
+                # Truncation would put values above the view into row 0
+                t = (x_lim[1] - x) * scale
+                if 0 <= t < n_x:
+                    hist[int(t),col] += 1
+                s += np.log(abs(rk * (1 - 2*x)))
+            if lyap.size:
+                lyap[k] = s / n_iter
+    return hist, lyap
+
+def bifurcation(r_lim=(2.5, 4), width=2000, height=1000, samples=8,
+                n_burn=900, n_iter=100, x0=1e-5, x_lim=(0, 1), lyapunov=False):
+    '''
+    Compute the density of the bifurcation diagram of the logistic map.
+
+    Parameters
+    ----------
+    r_lim : tuple, default=(2.5, 4)
+        Range of the parameter r along the horizontal axis.
+    width, height : int, default=(2000, 1000)
+        Number of bins along r and x.
+    samples : int, default=8
+        Number of values of r in every column of the histogram.
+    n_burn : int, default=900
+        Number of iterations discarded before the attractor is reached.
+    n_iter : int, default=100
+        Number of iterations added to the histogram.
+    x0 : float, default=1e-5
+        Starting point of the iterations.
+    x_lim : tuple, default=(0, 1)
+        Range of x along the vertical axis.
+    lyapunov : bool, default=False
+        Also compute the Lyapunov exponent for every value of r.
+
+    Returns
+    -------
+    density : np.ndarray
+        Number of visits of shape `(height, width)`, with the first row
+        at the upper limit of `x_lim`.
+    r : np.ndarray
+        The values of r.
+    lyap : np.ndarray or None
+        The Lyapunov exponent for every value of r, if requested.
+    '''
+    r = np.linspace(*r_lim, width * samples)
+    hist = np.zeros((height, width), dtype=np.uint32)
+    lyap = np.empty(r.size if lyapunov else 0)
+    bifurcation_block(r, float(x0), n_burn, n_iter,
+                      np.array(x_lim, dtype=float), hist, lyap)
+    return hist, r, (lyap if lyapunov else None)
+
+def bifurcation_image(density, cmap='binary', gamma=0.5):
+    '''
+    Color a bifurcation density through a uint8 lookup table, with the
+    density of every column normalised to its maximum, so the thin
+    branches of the chaotic regime stay visible.
+
+    Returns
+    -------
+    np.ndarray
+        uint8 RGBA image of shape `(*density.shape, 4)`.
+    '''
+    lut = get_cmap(cmap)(np.linspace(0, 1, 256), bytes=True)
+    t = density / np.maximum(density.max(axis=0), 1)
+    idx = (t**gamma * 255).astype(np.uint8)
+    return np.take(lut, idx, axis=0)
@@ -0,0 +1,194 @@
+import numpy as np
+from numba import njit, prange
+
+
+# Views of the notebook, as `(re_lim, im_lim, max_iter)`. The notebook
+# lists them as `[x_min, x_max, y_min, y_max, max_iter]`, but it puts
+# the second pair on the real axis, so the pairs are swapped here.
+ITERS = {
+    1 : ((-2, 2), (-2, 2), 64),
+    2 : ((-0.25, 0.25), (-1, -0.5), 128),
+    3 : ((-0.1, 0.1), (-0.7, -0.5), 256),
+    4 : ((-0.1, -0.05), (-0.675, -0.625), 512),
+    5 : ((-0.1, -0.075), (-0.6625, -0.6375), 1024),
+    6 : ((-0.095, -0.09), (-0.6525, -0.6475), 2048),
+    7 : ((-0.09275, -0.09225), (-0.65025, -0.64975), 2048),
+    8 : ((-0.09255, -0.09245), (-0.64990, -0.64980), 4096),
+    9 : ((-0.0925125, -0.0924875), (-0.649875, -0.64985), 4096),
+    10 : ((-0.75, -0.74), (0.06, 0.07), 2048),
+    11 : ((-0.74877, -0.74872), (0.06505, 0.06510), 4096),
+}
+
+
+#######
+#
+#    ESCAPE-TIME KERNEL
+#
+##########################################################################
+
+@njit(inline='always')
+def in_main_bulbs(cr, ci):
+    '''
+    Check whether c is inside the main cardioid or the period-2 bulb,
+    where the iteration never escapes.
+    '''
+    x = cr - 0.25
+    ci2 = ci*ci
+    q = x*x + ci2
+    if q * (q + x) <= 0.25 * ci2:
+        return True
+    return (cr + 1)*(cr + 1) + ci2 <= 0.0625
+
+@njit(inline='always')
+def iterate_orbit(zr, zi, cr, ci, max_iter, bailout2=4.0):
+    '''
+    Iterate z -> z^2 + c from z until |z|^2 exceeds `bailout2`.
+
+    The orbit is checked for exact cycles against a reference point,
+    which is updated in doubling intervals (Brent's method).
+
+    Returns
+    -------
+    n : int
+        Number of iterations taken before escaping, or -1 if the point
+        did not escape in `max_iter` iterations.
+    z2 : float
+        |z|^2 of the first point outside the bailout radius.
+    '''
+    ref_r, ref_i = zr, zi
+    period = 8
+    for n in range(max_iter):
+        zr2, zi2 = zr*zr, zi*zi
+        if zr2 + zi2 > bailout2:
+            return n, zr2 + zi2
+        zi = 2*zr*zi + ci
+        zr = zr2 - zi2 + cr
+
+        if (zr == ref_r) and (zi == ref_i):
+            return -1, 0.0
+        if (n + 1) % period == 0:
+            ref_r, ref_i = zr, zi
+            period *= 2
+    return -1, 0.0
+
+@njit(inline='always')
+def escape_orbit(cr, ci, max_iter, bailout2=4.0):
+    '''
+    Iterate z -> z^2 + c from z = c until |z|^2 exceeds `bailout2`.
+
+    Points inside the main cardioid and the period-2 bulb are rejected
+    without iterating, and the orbits of the other points are checked
+    for cycles by `iterate_orbit`.
+
+    Returns
+    -------
+    n, z2 :
+        See `iterate_orbit`.
+    '''
+    if in_main_bulbs(cr, ci):
+        return -1, 0.0
+    return iterate_orbit(cr, ci, cr, ci, max_iter, bailout2)
+
+@njit
+def escape_time(cr, ci, max_iter):
+    '''
+    Get the number of iterations of z -> z^2 + c, started from z = c,
+    before |z| exceeds 2. Points that do not escape in `max_iter`
+    iterations get 0, as in the notebook.
+    '''
+    n, _ = escape_orbit(cr, ci, max_iter)
+    return max(n, 0)
+
+@njit(parallel=True, nogil=True)
+def escape_time_block(re, im, max_iter, out):
+    '''
+    Fill `out[i,j]` with the escape time of `re[j] + 1j*im[i]`, in
+    parallel over the rows.
+    '''
+    for i in prange(im.size):
+        for j in range(re.size):
+            out[i,j] = escape_time(re[j], im[i], max_iter)
+    return out
+
+
+#######
+#
+#    RENDERING
+#
+##########################################################################
+
+def iter_dtype(max_iter):
+    '''
+    Get the smallest of uint16 and uint32 holding iteration counts up
+    to `max_iter`.
+    '''
+    return np.uint16 if max_iter < 2**16 else np.uint32
+
+def mandelbrot_axes(re_lim, im_lim, width, height):
+    '''
+    Get the coordinates of the pixel columns and rows, with the first
+    row corresponding to the upper limit of `im_lim`.
+    '''
+    return np.linspace(*re_lim, width), np.linspace(*im_lim[::-1], height)
+
+def mandelbrot_set(re_lim, im_lim, max_iter, width, height, out=None):
+    '''
+    Compute the escape time of every pixel of a view of the Mandelbrot
+    set.
+
+    Parameters
+    ----------
+    re_lim, im_lim : tuple
+        Limits of the view along the real and imaginary axes.
+    max_iter : int
+        Maximum number of iterations.
+    width, height : int
+        Number of pixels along the real and imaginary axes.
+    out : np.ndarray, optional
+        Array of shape `(height, width)` to write the result into. It
+        defaults to a new array of `iter_dtype(max_iter)`.
+
+    Returns
+    -------
+    np.ndarray
+        Escape times of shape `(height, width)`, with the first row
+        corresponding to the upper limit of `im_lim`. Points of the set
+        have 0. The notebook's `n3` of the same view is `out[::-1].T`.
+    '''
+    if out is None:
+        out = np.empty((height, width), dtype=iter_dtype(max_iter))
+    re, im = mandelbrot_axes(re_lim, im_lim, width, height)
+    return escape_time_block(re, im, max_iter, out)
+
+def mandelbrot_tiled(re_lim, im_lim, max_iter, width, height, fname,
+                     tile=1024):
+    '''
+    Compute the escape times of a view tile by tile into a memory-mapped
+    `.npy` file, so views larger than the memory can be rendered. The
+    result is identical to the one of `mandelbrot_set`.
+
+    Parameters
+    ----------
+    re_lim, im_lim, max_iter, width, height :
+        See `mandelbrot_set`.
+    fname : str
+        Path of the `.npy` file to write the escape times into.
+    tile : int, default=1024
+        Size of the square tiles the view is computed in.
+
+    Returns
+    -------
+    np.memmap
+        Memory-mapped array of shape `(height, width)` backed by `fname`.
+    '''
+    re, im = mandelbrot_axes(re_lim, im_lim, width, height)
+    out = np.lib.format.open_memmap(fname, mode='w+',
+                                    dtype=iter_dtype(max_iter),
+                                    shape=(height, width))
+    for r in range(0, height, tile):
+        for c in range(0, width, tile):
+            escape_time_block(re[c:c+tile], im[r:r+tile], max_iter,
+                              out[r:r+tile,c:c+tile])
+    out.flush()
+
+    return out
@@ -0,0 +1,235 @@
+'''
+Deep zooms into the Mandelbrot set with perturbation theory.
+
+A single reference orbit W_k is computed in arbitrary precision with
+`decimal`, and every pixel c = C + dc is iterated as a float64 delta
+d_k = w_k - W_k from it, with
+
+    d_{k+1} = 2 W_k d_k + d_k^2 + dc,
+
+which stays accurate when the view is far narrower than the float64
+spacing around C. The first iterations are skipped with a series
+approximation of d_k in powers of dc. Pixels whose delta becomes as
+large as the orbit itself lose precision ("glitches"); they are detected
+and recomputed from a new reference orbit inside the glitched area.
+'''
+from decimal import Decimal, localcontext
+
+import numpy as np
+from numba import njit, prange
+
+from .mandelbrot import iter_dtype
+
+
+#######
+#
+#    REFERENCE ORBIT AND SERIES APPROXIMATION
+#
+##########################################################################
+
+def reference_orbit(c_re, c_im, max_iter, prec=50):
+    '''
+    Iterate z -> z^2 + c from z = c in arbitrary precision.
+
+    Parameters
+    ----------
+    c_re, c_im : str or Decimal
+        Real and imaginary part of the reference point. Strings keep
+        every digit of deep zoom targets.
+    max_iter : int
+        Maximum number of iterations.
+    prec : int, default=50
+        Number of significant decimal digits of the iteration.
+
+    Returns
+    -------
+    np.ndarray
+        The orbit W_0, W_1, ... rounded to complex128, until it escapes
+        (including the first point outside of |z| = 2) or `max_iter`
+        iterations are taken.
+    '''
+    Z = np.empty(max_iter + 1, dtype=complex)
+    with localcontext() as ctx:
+        ctx.prec = prec
+        cr, ci = Decimal(c_re), Decimal(c_im)
+        zr, zi = cr, ci
+        for k in range(max_iter + 1):
+            Z[k] = complex(float(zr), float(zi))
+            zr2, zi2 = zr*zr, zi*zi
+            if zr2 + zi2 > 4:
+                return Z[:k+1]
+            zr, zi = zr2 - zi2 + cr, 2*zr*zi + ci
+    return Z
+
+def series_skip(Z, r, tol=1e-12):
+    '''
+    Find the number of iterations which can be skipped by approximating
+    the deltas with a third order series d_k = A_k dc + B_k dc^2 + C_k dc^3.
+
+    The series is used as long as its last term is below `tol` times
+    the first one for every |dc| <= r, and no point of the view can
+    have escaped yet.
+
+    Returns
+    -------
+    k : int
+        The number of iterations to skip.
+    coeff : tuple of complex
+        The `(A_k, B_k, C_k)` coefficients at iteration k.
+    '''
+    A, B, C = 1+0j, 0j, 0j
+    for k in range(Z.size - 1):
+        A_, B_, C_ = 2*Z[k]*A + 1, 2*Z[k]*B + A*A, 2*Z[k]*C + 2*A*B
+        bound = abs(A_)*r + abs(B_)*r**2 + abs(C_)*r**3
+        if (abs(C_)*r**3 > tol * abs(A_)*r) or (abs(Z[k+1]) + bound >= 2):
+            return k, (A, B, C)
+        A, B, C = A_, B_, C_
+    return Z.size - 1, (A, B, C)
+
+
+#######
+#
+#    PERTURBED ITERATION
+#
+##########################################################################
+
+@njit(parallel=True)
+def perturb_block(dc_re, dc_im, d_re, d_im, k0, Z_re, Z_im, max_iter,
+                  glitch_tol, out, glitch):
+    '''
+    Iterate the deltas of the pixels from iteration `k0`, and write their
+    escape times into `out`. Glitched pixels get the ratio |z|/|W| at
+    which they were detected in `glitch`, and 0 in `out`; `glitch` is
+    NaN for the other pixels.
+    '''
+    m = Z_re.size
+    tol2 = glitch_tol * glitch_tol
+    for p in prange(dc_re.size):
+        cr, ci = dc_re[p], dc_im[p]
+        dr, di = d_re[p], d_im[p]
+        out[p] = 0
+        glitch[p] = np.nan
+        for k in range(k0, max_iter):
+            if k >= m:
+                # The reference escaped before this pixel
+                glitch[p] = 1.0
+                break
+            wr, wi = Z_re[k], Z_im[k]
+            zr, zi = wr + dr, wi + di
+            z2 = zr*zr + zi*zi
+            if z2 > 4.0:
+                out[p] = k
+                break
+            w2 = wr*wr + wi*wi
+            if z2 < tol2 * w2:
+                glitch[p] = np.sqrt(z2 / w2)
+                break
+            dr, di = (2*(wr*dr - wi*di) + dr*dr - di*di + cr,
+                      2*(wr*di + wi*dr) + 2*dr*di + ci)
+
+def perturb(c_re, c_im, dc, max_iter, prec=50, series=True, sa_tol=1e-12,
+            glitch_tol=1e-3):
+    '''
+    Compute the escape times of the points `c + dc` by perturbation
+    around the reference point c.
+
+    Returns
+    -------
+    out : np.ndarray
+        Escape times of the points, 0 for the points of the set and the
+        glitched points.
+    glitch : np.ndarray
+        Glitch ratio of the glitched points, NaN elsewhere.
+    '''
+    Z = reference_orbit(c_re, c_im, max_iter, prec=prec)
+    if series:
+        k0, (A, B, C) = series_skip(Z, np.abs(dc).max(), tol=sa_tol)
+    else:
+        k0, (A, B, C) = 0, (1, 0, 0)
+    d = dc * (A + dc * (B + dc * C))
+
+    out = np.empty(dc.size, dtype=iter_dtype(max_iter))
+    glitch = np.empty(dc.size)
+    perturb_block(dc.real.copy(), dc.imag.copy(), d.real.copy(), d.imag.copy(),
+                  k0, Z.real.copy(), Z.imag.copy(), max_iter, glitch_tol,
+                  out, glitch)
+    return out, glitch
+
+
+#######
+#
+#    RENDERING
+#
+##########################################################################
+
+def mandelbrot_deep(center, width, max_iter, N_x, N_y, prec=None,
+                    series=True, sa_tol=1e-12, glitch_tol=1e-3, max_refs=16):
+    '''
+    Compute the escape time of every pixel of a deep zoom into the
+    Mandelbrot set.
+
+    Parameters
+    ----------
+    center : tuple of str or Decimal
+        Real and imaginary part of the center of the view, in as many
+        digits as the zoom depth requires.
+    width : float
+        Width of the view along the real axis. The pixels are square.
+    max_iter : int
+        Maximum number of iterations.
+    N_x, N_y : int
+        Number of pixels along the real and imaginary axes.
+    prec : int, optional
+        Number of significant decimal digits of the reference orbits.
+        Defaults to 20 digits more than the depth of the zoom.
+    series : bool, default=True
+        Skip the first iterations with a series approximation.
+    sa_tol : float, default=1e-12
+        Relative truncation error allowed in the series approximation.
+    glitch_tol : float, default=1e-3
+        Pixels with |z| < glitch_tol * |W| are considered glitched.
+    max_refs : int, default=16
+        Maximum number of reference orbits. Pixels still glitched after
+        the last one are left at 0.
+
+    Returns
+    -------
+    out : np.ndarray
+        Escape times of shape `(N_y, N_x)` with the first row at the top
+        of the view, in the convention of `mandelbrot.mandelbrot_set`.
+    n_refs : int
+        Number of reference orbits used.
+    '''
+    h = width / max(N_x - 1, 1)
+    if prec is None:
+        prec = 20 + max(0, int(-np.log10(h)))
+
+    # Offsets of the pixels from the center
+    dx = (np.arange(N_x) - (N_x - 1) / 2) * h
+    dy = ((N_y - 1) / 2 - np.arange(N_y)) * h
+    dc = (dx[None,:] + 1j*dy[:,None]).ravel()
+
+    c_re, c_im = Decimal(center[0]), Decimal(center[1])
+    out, glitch = perturb(c_re, c_im, dc, max_iter, prec=prec, series=series,
+                          sa_tol=sa_tol, glitch_tol=glitch_tol)
+
+    n_refs = 1
+    todo = np.flatnonzero(~np.isnan(glitch))
+    while todo.size and (n_refs < max_refs):
+        # The new reference is the most glitched pixel, which lies
+        # closest to the center of the glitched area
+        p = todo[np.argmin(glitch[todo])]
+        with localcontext() as ctx:
+            ctx.prec = prec
+            r_re = c_re + Decimal(float(dc[p].real))
+            r_im = c_im + Decimal(float(dc[p].imag))
+        out_g, glitch_g = perturb(r_re, r_im, dc[todo] - dc[p], max_iter,
+                                  prec=prec, series=series, sa_tol=sa_tol,
+                                  glitch_tol=glitch_tol)
+        out[todo], glitch[todo] = out_g, glitch_g
+        # A reference that is glitched itself is not retried
+        glitch[p] = np.nan
+        todo = todo[~np.isnan(glitch[todo])]
+        n_refs += 1
+
+    return out.reshape(N_y, N_x), n_refs
@@ -0,0 +1,193 @@
+'''
+Zoom sequences through keyframes of the Mandelbrot set.
+
+The kernels release the GIL, so frames are rendered in the calling
+thread while a writer thread encodes the previous ones, fed through a
+bounded queue that keeps only a few frames in memory.
+'''
+import queue
+import threading
+
+import numpy as np
+
+from .mandelbrot import ITERS
+from .color import mandelbrot_smooth, equalize, smooth_palette, smooth_colors
+
+
+#######
+#
+#    ZOOM PATH
+#
+##########################################################################
+
+def zoom_keyframes(keys=None):
+    '''
+    Get the `(center, width, max_iter)` keyframes of the views of the
+    notebook in `ITERS`.
+
+    Parameters
+    ----------
+    keys : sequence of ints, optional
+        Keys of the views in the order of the sequence. Defaults to every
+        view in the order of their keys.
+    '''
+    if keys is None: keys = sorted(ITERS)
+    keyframes = []
+    for k in keys:
+        (x0, x1), (y0, y1), max_iter = ITERS[k]
+        keyframes.append((complex((x0 + x1) / 2, (y0 + y1) / 2),
+                          x1 - x0, max_iter))
+    return keyframes
+
+def zoom_path(keyframes, frames_per_decade=30, n_min=30):
+    '''
+    Interpolate the views of the frames between keyframes.
+
+    The width of the view changes geometrically between two keyframes,
+    so every frame zooms by the same factor. The center moves with the
+    width, keeping the next keyframe at a fixed position on the screen,
+    and `max_iter` is interpolated geometrically along with the width.
+
+    Parameters
+    ----------
+    keyframes : sequence of tuples
+        The `(center, width, max_iter)` of every keyframe, e.g. the
+        output of `zoom_keyframes`.
+    frames_per_decade : int, default=30
+        Number of frames for every order of magnitude of zoom.
+    n_min : int, default=30
+        Minimum number of frames between two keyframes.
+
+    Returns
+    -------
+    centers : np.ndarray of complex
+        Center of every frame.
+    widths : np.ndarray
+        Width of the view of every frame along the real axis.
+    max_iters : np.ndarray of ints
+        Maximum number of iterations of every frame.
+    '''
+    centers, widths, max_iters = [], [], []
+    for (c0, w0, m0), (c1, w1, m1) in zip(keyframes[:-1], keyframes[1:]):
+        n = max(n_min, int(np.ceil(frames_per_decade * abs(np.log10(w1 / w0)))))
+        t = np.arange(n) / n
+        w = w0 * (w1 / w0)**t
+
+        # Fraction of the path left, measured in the size of the view
+        f = (w - w1) / (w0 - w1) if w0 != w1 else 1 - t
+        centers.append(c1 + (c0 - c1) * f)
+        widths.append(w)
+        max_iters.append(np.rint(m0 * (m1 / m0)**t).astype(int))
+
+    c, w, m = keyframes[-1]
+    return (np.append(np.concatenate(centers), c),
+            np.append(np.concatenate(widths), w),
+            np.append(np.concatenate(max_iters), m))
+
+
+#######
+#
+#    RENDERING
+#
+##########################################################################
+
+def zoom_frames(centers, widths, max_iters, N_x, N_y, cmap='inferno',
+                cdf_decay=0.8):
+    '''
+    Render the frames of a zoom sequence with smooth, histogram-equalised
+    colors, and yield them in order.
+
+    Parameters
+    ----------
+    centers, widths, max_iters : np.ndarray
+        The views of the frames, as returned by `zoom_path`.
+    N_x, N_y : int
+        Number of pixels of the frames along the real and imaginary axes.
+    cmap : str or `~matplotlib.colors.Colormap`, default 'inferno'
+        Colormap of the frames.
+    cdf_decay : float, default=0.8
+        Weight of the color distribution of the previous frames in the
+        one of the current frame, which prevents flickering between
+        frames. With 0 every frame is equalised on its own.
+
+    Yields
+    ------
+    np.ndarray
+        uint8 RGBA frames of shape `(N_y, N_x, 4)`.
+    '''
+    lut = smooth_palette(cmap)
+    nu = np.empty((N_y, N_x), dtype=np.float32)
+    cdf = None
+    for c, w, m in zip(centers, widths, max_iters):
+        h = w / 2 * N_y / N_x
+        re_lim = (c.real - w/2, c.real + w/2)
+        im_lim = (c.imag - h, c.imag + h)
+        _, hist = mandelbrot_smooth(re_lim, im_lim, int(m), N_x, N_y, out=nu)
+
+        cdf_m = equalize(hist)
+        if cdf is not None:
+            # The previous distribution, resampled onto the current bins
+            prev = np.interp(np.arange(cdf_m.size), np.arange(cdf.size), cdf)
+            cdf_m = cdf_decay * prev + (1 - cdf_decay) * cdf_m
+        cdf = cdf_m
+
+        yield smooth_colors(nu, cdf, lut)
+
+def write_video(frames, fname, fps=30, codec='h264', bitrate='8000k',
+                queue_size=8):
+    '''
+    Encode a stream of uint8 RGB(A) frames into a video file in a writer
+    thread, while the next frames are rendered.
+
+    Parameters
+    ----------
+    frames : iterable of np.ndarrays
+        The frames of the video, e.g. the output of `zoom_frames`.
+    fname : str
+        Path of the output video file.
+    fps : int, default=30
+        Frame rate of the video.
+    codec : str, default='h264'
+        Video codec used by the writer.
+    bitrate : str, default='8000k'
+        Bitrate of the video.
+    queue_size : int, default=8
+        Maximum number of frames waiting to be encoded. Rendering blocks
+        when the queue is full.
+    '''
+    import imageio
+
+    q = queue.Queue(maxsize=queue_size)
+    error = []
+
+    def encode():
+        # The encoder process is started from this thread by the first
+        # frame. Starting it from the main thread after numba's TBB
+        # threading layer is initialised leaves it hanging on close.
+        writer = None
+        try:
+            writer = imageio.get_writer(fname, codec=codec, bitrate=bitrate,
+                                        format='mp4', fps=fps)
+            while (frame := q.get()) is not None:
+                writer.append_data(frame[...,:3])
+        except Exception as e:
+            error.append(e)
+            # Keep draining the queue, so the renderer does not block
+            while q.get() is not None:
+                pass
+        finally:
+            if writer is not None:
+                writer.close()
+
+    thread = threading.Thread(target=encode)
+    thread.start()
+    try:
+        for frame in frames:
+            if error:
+                break
+            q.put(frame)
+    finally:
+        q.put(None)
+        thread.join()
+    if error:
+        raise error[0]
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import matplotlib.pyplot as plt
+
+from mandelbrot.mandelbrot import ITERS, mandelbrot_set, mandelbrot_tiled
+from mandelbrot.color import mandelbrot_image, mandelbrot_image_tiled
+
+
+if __name__ == '__main__':
+
+  USAGE = 'USAGE: python mandelbrot_render.py <n> <N> [--npy] [--smooth]'
+  args = [a for a in sys.argv[1:] if not a.startswith('--')]
+  flags = [a for a in sys.argv[1:] if a.startswith('--')]
+  assert len(args) == 2, USAGE
+  assert set(flags) <= {'--npy', '--smooth'}, USAGE
+
+  n = int(args[0])
+  N = int(args[1])
+  re_lim, im_lim, max_iter = ITERS[n]
+
+  outdir = './out/'
+  os.makedirs(outdir, exist_ok=True)
+  fname = outdir + 'mandelbrot_{0}_re_{1}_{2}_im_{3}_{4}_maxiter_{5}'.format(
+            n, *re_lim, *im_lim, max_iter)
+
+  # Large views are written tile by tile into a memory-mapped array
+  if '--smooth' in flags:
+    if '--npy' in flags:
+      mandelbrot_image_tiled(re_lim, im_lim, max_iter, N, N, fname + '.npy')
+    else:
+      plt.imsave(fname + '.png', mandelbrot_image(re_lim, im_lim, max_iter, N, N))
+  elif '--npy' in flags:
+    mandelbrot_tiled(re_lim, im_lim, max_iter, N, N, fname + '.npy')
+  else:
+    n3 = mandelbrot_set(re_lim, im_lim, max_iter, N, N)
+    plt.imsave(fname + '.png', n3, cmap='inferno')
@@ -0,0 +1,27 @@
+import os
+import sys
+from tqdm import tqdm
+
+from mandelbrot.zoom import zoom_keyframes, zoom_path, zoom_frames, write_video
+
+
+if __name__ == '__main__':
+
+  USAGE = 'USAGE: python mandelbrot_zoom.py <N_x> <N_y> <frames_per_decade> [keys...]'
+  assert len(sys.argv) >= 4, USAGE
+
+  N_x = int(sys.argv[1])
+  N_y = int(sys.argv[2])
+  frames_per_decade = int(sys.argv[3])
+  keys = [int(k) for k in sys.argv[4:]] or None
+
+  outdir = './out/anim/'
+  os.makedirs(outdir, exist_ok=True)
+
+  centers, widths, max_iters = zoom_path(zoom_keyframes(keys),
+                                         frames_per_decade=frames_per_decade)
+  frames = tqdm(zoom_frames(centers, widths, max_iters, N_x, N_y),
+                total=len(centers))
+
+  name = 'mandelbrot_zoom-{}x{}-fpd{}'.format(N_x, N_y, frames_per_decade)
+  write_video(frames, outdir + name + '.mp4')
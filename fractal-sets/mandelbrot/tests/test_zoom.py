@@ -0,0 +1,30 @@
+import threading
+
+import numpy as np
+import pytest
+
+imageio = pytest.importorskip('imageio')
+
+from mandelbrot.zoom import write_video
+
+
+def test_write_video_encoder_failure(monkeypatch):
+    # An encoder that cannot be started must not leave the renderer
+    # blocked on the full queue
+    def get_writer(*args, **kwargs):
+        raise RuntimeError('no encoder')
+    monkeypatch.setattr(imageio, 'get_writer', get_writer)
+
+    frames = (np.zeros((8, 8, 4), dtype=np.uint8) for _ in range(100))
+    result = []
+    def run():
+        try:
+            write_video(frames, 'unused.mp4', queue_size=2)
+        except RuntimeError as e:
+            result.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive()
+    assert len(result) == 1 and str(result[0]) == 'no encoder'
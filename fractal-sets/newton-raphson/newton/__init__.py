@@ -0,0 +1,21 @@
+'''
+Newton-Raphson fractals.
+
+The computational core (`polynomial`, `newton`, `ddouble`, `tiled`,
+`quadtree`, `batch`, `cache`, `anim`, `png`, `instrument`, `server`,
+`stats`) only depends on numpy; matplotlib is imported only when a
+colormap is looked up by name. The plotting modules (`fractal`, `demo`) import
+matplotlib and seaborn, and are loaded on first access.
+'''
+import importlib
+
+from .polynomial import Polynomial
+
+_submodules = ('polynomial', 'newton', 'ddouble', 'tiled', 'quadtree',
+               'batch', 'cache', 'anim', 'png', 'instrument', 'server',
+               'stats', 'fractal', 'demo')
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,175 @@
+from itertools import repeat
+from collections import deque
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .newton import nr_palette
+from .tiled import nr_image_axes, nr_render_block
+
+
+#######
+#
+#    ANIMATION WORKERS
+#
+##########################################################################
+
+# State of a worker process, set once by `_worker_init`
+_worker = {}
+
+def _worker_init(shm_name, buffer_shape, P, N, lut, tol, root_tol, precision,
+                 dd_switch):
+    '''
+    Attach a worker process to the shared frame buffer and store the
+    settings shared by every frame, so that tasks only have to carry
+    the frame and the rows to render.
+    '''
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker.update(shm=shm,
+                   buffer=np.ndarray(buffer_shape, dtype=np.uint8, buffer=shm.buf),
+                   P=P, N=N, lut=lut, tol=tol, root_tol=root_tol,
+                   precision=precision, dd_switch=dd_switch, frame=None)
+
+def _worker_axes(gl):
+    '''
+    Get the coordinate axes of a frame, reusing them between the bands
+    of the same frame.
+    '''
+    if _worker['frame'] != gl:
+        _worker['frame'] = gl
+        _worker['axes'] = nr_image_axes(_worker['N'], *gl,
+                                        precision=_worker['precision'])
+    return _worker['axes']
+
+def _worker_render(slot, gl, n_steps, r0, r1):
+    '''
+    Render rows [r0, r1) of a frame into a slot of the shared buffer.
+    '''
+    axes, (Ny, Nx), precision, h = _worker_axes(gl)
+    _worker['buffer'][slot,r0:r1,:Nx] = \
+        nr_render_block(_worker['P'], axes, precision, h,
+                        slice(r0, r1), slice(None),
+                        n_steps, _worker['lut'],
+                        tol=_worker['tol'], root_tol=_worker['root_tol'],
+                        dd_switch=_worker['dd_switch'])
+
+
+#######
+#
+#    ANIMATION RENDERING
+#
+##########################################################################
+
+def nr_frames(P, grid_lims, N, n_steps, n_jobs=1, cmap='viridis',
+              tol=None, n_shades=1, root_tol=None, precision='auto',
+              dd_switch=1e-10, n_slots=None, band_pixels=2**18):
+    '''
+    Render the frames of a Newton-Raphson fractal animation in parallel
+    and yield them in order as uint8 RGBA images, as soon as they are
+    completed.
+
+    Frames are split into bands of rows, which are rendered by a pool of
+    persistent worker processes directly into a ring buffer of frames in
+    shared memory, so large frames are rendered by every worker, and
+    the frames are never pickled.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    grid_lims : sequence of tuples
+        The `(grid_lim_x, grid_lim_y)` limits of every frame.
+    N : int
+        Approximate number of pixels along the shorter side of a frame.
+    n_steps : int or sequence of ints
+        (Maximum) number of Newton-Raphson iterations to take, either
+        for all frames or for every frame separately, e.g. as returned
+        by `newton.newton.NR_fractal_get_steps`.
+    n_jobs : int, default=1
+        Number of worker processes rendering the frames.
+    cmap, tol, n_shades, root_tol, precision, dd_switch : optional
+        See `newton.newton.nr_image`.
+    n_slots : int, optional
+        Number of frames in the ring buffer, i.e. the maximum number of
+        frames being rendered at once. Defaults to `2 * n_jobs`.
+    band_pixels : int, default=2**18
+        Approximate number of pixels in a band of rows.
+
+    Yields
+    ------
+    np.ndarray
+        The frames as arrays of shape `(Ny, Nx, 4)`. They are views into
+        the ring buffer, which are only valid until the next frame is
+        requested: copy them if they are needed longer.
+    '''
+    if n_slots is None: n_slots = 2 * n_jobs
+    if np.ndim(n_steps) == 0: n_steps = repeat(int(n_steps))
+    lut = nr_palette(len(P.roots()), cmap=cmap, n_shades=n_shades)
+
+    # Every slot of the buffer fits the largest frame
+    shapes = [nr_image_axes(N, *gl, precision=precision)[1] for gl in grid_lims]
+    buffer_shape = (n_slots, *np.max(shapes, axis=0), 4)
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(buffer_shape)))
+    buffer = np.ndarray(buffer_shape, dtype=np.uint8, buffer=shm.buf)
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_jobs,
+                                 initializer=_worker_init,
+                                 initargs=(shm.name, buffer_shape, P, N, lut,
+                                           tol, root_tol, precision,
+                                           dd_switch)) as pool:
+            pending = deque()
+            frames = enumerate(zip(grid_lims, n_steps, shapes))
+            for i, (gl, ns, (Ny, Nx)) in frames:
+                # Submit every band of the frame into the next free slot
+                rows = max(1, band_pixels // Nx)
+                bands = [pool.submit(_worker_render, i % n_slots, gl, int(ns),
+                                     r, min(r + rows, Ny))
+                         for r in range(0, Ny, rows)]
+                pending.append((i % n_slots, Ny, Nx, bands))
+
+                if len(pending) == n_slots:
+                    yield _nr_collect(buffer, *pending.popleft())
+            while pending:
+                yield _nr_collect(buffer, *pending.popleft())
+    finally:
+        del buffer
+        shm.close()
+        shm.unlink()
+
+def _nr_collect(buffer, slot, Ny, Nx, bands):
+    '''
+    Wait for every band of a frame and return it from the buffer.
+    '''
+    for band in bands:
+        band.result()
+    return buffer[slot,:Ny,:Nx]
+
+def nr_write_video(frames, fname, fps=30, codec='h264', bitrate='3500k'):
+    '''
+    Encode a stream of uint8 RGB(A) frames into a video file.
+
+    Parameters
+    ----------
+    frames : iterable of np.ndarrays
+        The frames of the video, e.g. the output of `nr_frames`.
+    fname : str
+        Path of the output video file.
+    fps : int, default=30
+        Frame rate of the video.
+    codec : str, default='h264'
+        Video codec used by the writer.
+    bitrate : str, default='3500k'
+        Bitrate of the video.
+    '''
+    import imageio
+
+    writer = imageio.get_writer(fname, codec=codec, bitrate=bitrate,
+                                format='mp4', fps=fps)
+    try:
+        for frame in frames:
+            writer.append_data(frame[...,:3])
+    finally:
+        writer.close()
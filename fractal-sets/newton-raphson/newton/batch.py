@@ -0,0 +1,157 @@
+import numpy as np
+
+from .polynomial import Polynomial
+from .newton import get_starting_grid, nr_basins
+
+
+#######
+#
+#    POLYNOMIAL FAMILIES
+#
+##########################################################################
+
+def poly_family(coeff, index, values):
+    '''
+    Generate the coefficients of a family of polynomials, where a single
+    coefficient of a base polynomial takes different values.
+
+    Parameters
+    ----------
+    coeff : list or np.ndarray
+        Coefficients of the base polynomial, with the highest degree
+        first.
+    index : int
+        Index of the varied coefficient in `coeff`.
+    values : array-like
+        Values of the varied coefficient.
+
+    Returns
+    -------
+    np.ndarray
+        Coefficients of the polynomials with shape `(len(values), d+1)`.
+    '''
+    C = np.tile(np.asarray(coeff, dtype=float), (len(values), 1))
+    C[:,index] = values
+    return C
+
+def match_roots(R):
+    '''
+    Reorder the roots of every polynomial of a batch to follow the roots
+    of the previous one, so the index of a root changes continuously
+    along a family of polynomials. The pairs of a previous and a current
+    root are assigned greedily, the closest pairs first.
+
+    Parameters
+    ----------
+    R : np.ndarray
+        Roots of the polynomials with shape `(B, d)`.
+
+    Returns
+    -------
+    np.ndarray
+        The reordered roots with shape `(B, d)`.
+    '''
+    R = np.array(R)
+    d = R.shape[1]
+    for b in range(1, R.shape[0]):
+        D = np.abs(R[b-1][:,None] - R[b][None,:])
+        order = np.empty(d, dtype=int)
+        free_prev, free_cur = np.ones(d, dtype=bool), np.ones(d, dtype=bool)
+        for i, j in zip(*np.unravel_index(np.argsort(D, axis=None), D.shape)):
+            if free_prev[i] and free_cur[j]:
+                order[i] = j
+                free_prev[i], free_cur[j] = False, False
+        R[b] = R[b][order]
+    return R
+
+def batch_roots(C, match=True):
+    '''
+    Calculate the roots of a batch of polynomials of the same degree at
+    once, as the eigenvalues of their companion matrices.
+
+    Parameters
+    ----------
+    C : np.ndarray
+        Coefficients of the polynomials with shape `(B, d+1)`, with the
+        highest degree first.
+    match : bool, default=True
+        If True, the roots of every polynomial are ordered to follow the
+        roots of the previous one, see `match_roots`.
+
+    Returns
+    -------
+    np.ndarray
+        Roots of the polynomials with shape `(B, d)`.
+    '''
+    C = np.asarray(C, dtype=float)
+    if np.any(C[:,0] == 0):
+        raise ValueError('Leading coefficients of the polynomials cannot be zero.')
+
+    B, d = C.shape[0], C.shape[1] - 1
+    companion = np.zeros((B, d, d))
+    companion[:,0,:] = -C[:,1:] / C[:,:1]
+    companion[:,np.arange(1, d),np.arange(d-1)] = 1
+    R = np.linalg.eigvals(companion)
+    return match_roots(R) if match else R
+
+
+#######
+#
+#    BATCHED NEWTON-RAPHSON METHOD
+#
+##########################################################################
+
+def batch_nr_basins(C, N, n_steps, grid_lim_x, grid_lim_y,
+                    tol=None, root_tol=None):
+    '''
+    Get the root index of every point of a grid for a batch of
+    polynomials of the same degree. The roots of every polynomial are
+    found at once, and the starting grid is computed once and shared.
+
+    This is not a batched kernel: the polynomials are iterated in a
+    loop, one `nr_basins` call over the shared grid each. A numpy
+    iteration over a stacked `(B, Ny, Nx)` array was not faster, as
+    its passes are limited by the memory bandwidth.
+
+    Parameters
+    ----------
+    C : np.ndarray
+        Coefficients of the polynomials with shape `(B, d+1)`, e.g. from
+        `poly_family`.
+    N : int
+        Approximate number of pixels along the shorter side of the grid.
+    n_steps : int
+        (Maximum) number of Newton-Raphson iterations to take.
+    grid_lim_x, grid_lim_y : tuple
+        Limits of the grid along the real and imaginary axes.
+    tol, root_tol : float, optional
+        See `newton.newton.nr_basins`.
+
+    Returns
+    -------
+    idx : np.ndarray
+        Root indices with shape `(B, Ny, Nx)`. The roots of every
+        polynomial are ordered as returned by `batch_roots`, so the
+        indices follow the roots along a family of polynomials.
+    n_iter : np.ndarray or None
+        Number of iterations with shape `(B, Ny, Nx)`, if `tol` is given.
+    '''
+    C = np.asarray(C, dtype=float)
+    R = batch_roots(C)
+
+    X_0 = get_starting_grid(N, grid_lim_x, grid_lim_y[::-1])
+    idx = np.empty((C.shape[0], *X_0.shape),
+                   dtype=np.min_scalar_type(R.shape[1]))
+    n_iter = None
+    if tol is not None:
+        n_iter = np.empty((C.shape[0], *X_0.shape),
+                          dtype=np.min_scalar_type(n_steps))
+
+    for b, (c, r) in enumerate(zip(C, R)):
+        idx_b, n_iter_b = nr_basins(Polynomial(c, roots=r), X_0, n_steps,
+                                    tol=tol, root_tol=root_tol)
+        idx[b] = idx_b
+        if tol is not None:
+            n_iter[b] = n_iter_b
+
+    return idx, n_iter
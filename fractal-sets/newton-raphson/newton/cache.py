@@ -0,0 +1,124 @@
+import os
+import json
+import shutil
+import hashlib
+
+import numpy as np
+
+
+class BasinCache():
+
+    def __init__(self, path='./out/cache/', max_bytes=2**30):
+        '''
+        Initialize an on-disk cache of computed Newton-Raphson basins.
+        Every entry is stored in its own directory as `.npy` files,
+        which are loaded memory-mapped. When the total size exceeds
+        `max_bytes`, the least recently used entries are evicted.
+
+        Parameters:
+        -----------
+        path : str
+            Directory to store the cache in.
+        max_bytes : int
+            Upper limit of the size of the cache in bytes.
+        '''
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def key(coeff, N, n_steps, grid_lim_x, grid_lim_y,
+            tol=None, root_tol=None, precision='float64',
+            method='newton', relax=1.0, quadtree=False, dd_switch=1e-10):
+        '''
+        Get the key of a render from every setting that affects its
+        result, as the SHA-256 hash of their canonical representation.
+        '''
+        settings = {
+            'coeff' : [float(c) for c in coeff],
+            'N' : int(N),
+            'n_steps' : int(n_steps),
+            'grid_lim_x' : [str(l) for l in grid_lim_x],
+            'grid_lim_y' : [str(l) for l in grid_lim_y],
+            'tol' : tol,
+            'root_tol' : root_tol,
+            'precision' : precision,
+            'method' : method,
+            'relax' : float(relax),
+            'quadtree' : bool(quadtree),
+            'dd_switch' : float(dd_switch),
+        }
+        s = json.dumps(settings, sort_keys=True)
+        return hashlib.sha256(s.encode()).hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.path, key)
+
+    def get(self, key):
+        '''
+        Get the root indices and iteration counts stored under a key as
+        memory-mapped arrays, or None if the key is not in the cache.
+        The iteration counts are None if they were not stored.
+        '''
+        entry = self._entry(key)
+        if not os.path.isdir(entry):
+            return None
+        os.utime(entry)
+
+        idx = np.load(os.path.join(entry, 'idx.npy'), mmap_mode='r')
+        fname = os.path.join(entry, 'n_iter.npy')
+        n_iter = np.load(fname, mmap_mode='r') if os.path.exists(fname) else None
+        return idx, n_iter
+
+    def put(self, key, idx, n_iter=None):
+        '''
+        Store root indices and iteration counts under a key, then evict
+        the least recently used entries if the cache grew too large.
+        '''
+        entry = self._entry(key)
+        tmp = entry + '.tmp{}'.format(os.getpid())
+        os.makedirs(tmp, exist_ok=True)
+        np.save(os.path.join(tmp, 'idx.npy'), idx)
+        if n_iter is not None:
+            np.save(os.path.join(tmp, 'n_iter.npy'), n_iter)
+
+        # Publish the entry atomically; keep the existing one on a race
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def _entries(self):
+        '''
+        List the (last access time, size, path) of every entry.
+        '''
+        entries = []
+        for key in os.listdir(self.path):
+            entry = self._entry(key)
+            if (not os.path.isdir(entry)) or ('.tmp' in key):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f))
+                       for f in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, entry))
+        return sorted(entries)
+
+    def evict(self):
+        '''
+        Remove the least recently used entries until the size of the
+        cache is below its limit.
+        '''
+        entries = self._entries()
+        total = sum(e[1] for e in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        '''
+        Remove every entry of the cache.
+        '''
+        for _, _, entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
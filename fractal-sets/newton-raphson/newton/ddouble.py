@@ -0,0 +1,291 @@
+from decimal import Decimal, localcontext
+
+import numpy as np
+
+from .newton import nr_converge, nr_classify, nr_lut_colors
+
+
+#######
+#
+#    DOUBLE-DOUBLE ARITHMETIC
+#
+#    A double-double number is a pair of float64 values (hi, lo), whose
+#    unevaluated sum represents the number with ~32 significant digits.
+#    A complex double-double number is a pair of such pairs (re, im).
+#    All operations work element-wise on numpy arrays.
+#
+##########################################################################
+
+_SPLIT = 134217729.0 # 2^27 + 1
+
+def _two_sum(a, b):
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+def _quick_two_sum(a, b):
+    s = a + b
+    return s, b - (s - a)
+
+def _split(a):
+    t = _SPLIT * a
+    hi = t - (t - a)
+    return hi, a - hi
+
+def _two_prod(a, b):
+    p = a * b
+    a_hi, a_lo = _split(a)
+    b_hi, b_lo = _split(b)
+    return p, ((a_hi*b_hi - p) + a_hi*b_lo + a_lo*b_hi) + a_lo*b_lo
+
+def dd_add(a, b):
+    '''
+    Add two double-double numbers.
+    '''
+    s, e = _two_sum(a[0], b[0])
+    t, f = _two_sum(a[1], b[1])
+    s, e = _quick_two_sum(s, e + t)
+    return _quick_two_sum(s, e + f)
+
+def dd_sub(a, b):
+    '''
+    Subtract two double-double numbers.
+    '''
+    return dd_add(a, (-b[0], -b[1]))
+
+def dd_mul(a, b):
+    '''
+    Multiply two double-double numbers.
+    '''
+    p, e = _two_prod(a[0], b[0])
+    return _quick_two_sum(p, e + (a[0]*b[1] + a[1]*b[0]))
+
+def dd_div(a, b):
+    '''
+    Divide two double-double numbers.
+    '''
+    q1 = a[0] / b[0]
+    r = dd_sub(a, dd_mul(b, (q1, 0.0)))
+    q2 = r[0] / b[0]
+    r = dd_sub(r, dd_mul(b, (q2, 0.0)))
+    q3 = r[0] / b[0]
+    return dd_add(_quick_two_sum(q1, q2), (q3, 0.0))
+
+def ddc_mul(a, b):
+    '''
+    Multiply two complex double-double numbers.
+    '''
+    return (dd_sub(dd_mul(a[0], b[0]), dd_mul(a[1], b[1])),
+            dd_add(dd_mul(a[0], b[1]), dd_mul(a[1], b[0])))
+
+def ddc_div(a, b):
+    '''
+    Divide two complex double-double numbers.
+    '''
+    d = dd_add(dd_mul(b[0], b[0]), dd_mul(b[1], b[1]))
+    re = dd_add(dd_mul(a[0], b[0]), dd_mul(a[1], b[1]))
+    im = dd_sub(dd_mul(a[1], b[0]), dd_mul(a[0], b[1]))
+    return dd_div(re, d), dd_div(im, d)
+
+def dd_from_decimal(x):
+    '''
+    Convert a number (or its string representation) into a double-double
+    number through `decimal.Decimal`, without losing precision.
+    '''
+    x = Decimal(str(x))
+    hi = float(x)
+    return hi, float(x - Decimal(hi))
+
+
+#######
+#
+#    DOUBLE-DOUBLE NEWTON-RAPHSON GRID
+#
+##########################################################################
+
+def nr_precision(N, limx, limy, rtol=1e-12):
+    '''
+    Select the arithmetic needed to resolve a grid: `'dd'` if the pixel
+    spacing is smaller than `rtol` relative to the coordinates, which
+    is where float64 pixel coordinates start to collapse, `'float64'`
+    otherwise.
+
+    Parameters
+    ----------
+    N : int
+        Approximate number of points along the shorter side of the grid.
+    limx, limy : tuple
+        Limits of the grid. Their elements can also be strings or
+        `decimal.Decimal` instances.
+    rtol : float, default=1e-12
+        Smallest relative pixel spacing rendered in float64.
+    '''
+    limx = [Decimal(str(l)) for l in limx]
+    limy = [Decimal(str(l)) for l in limy]
+    h = min(abs(limx[1] - limx[0]), abs(limy[1] - limy[0])) / max(N-1, 1)
+    scale = max(abs(l) for l in limx + limy)
+    return 'dd' if h < Decimal(rtol) * scale else 'float64'
+
+def get_grid_axes_dd(N, limx, limy):
+    '''
+    Double-double version of `newton.newton.get_grid_axes`. The limits
+    can also be given as strings or `decimal.Decimal` instances, to
+    specify them beyond float64 precision.
+
+    Returns
+    -------
+    (x, y) : tuple of double-double arrays
+        The coordinates along the X and Y dimension, respectively.
+    h : float
+        Pixel spacing of the grid.
+    '''
+    with localcontext() as ctx:
+        ctx.prec = 40
+        limx = [Decimal(str(l)) for l in limx]
+        limy = [Decimal(str(l)) for l in limy]
+        wx, wy = limx[1] - limx[0], limy[1] - limy[0]
+
+        dx = abs(wx) / abs(wy)
+        Nx = int(round(N * max(dx, 1)))
+        Ny = int(round(N * max(1/dx, 1)))
+
+        axes = []
+        for (l, _), w, n in ((limx, wx, Nx), (limy, wy, Ny)):
+            d = w / max(n-1, 1)
+            axes.append(tuple(np.array(a) for a in
+                              zip(*[dd_from_decimal(l + i*d) for i in range(n)])))
+        h = float(min(abs(wx) / max(Nx-1, 1), abs(wy) / max(Ny-1, 1)))
+
+    return tuple(axes), h
+
+def get_starting_grid_dd(x, y):
+    '''
+    Generate a complex double-double grid from its coordinate axes
+    returned by `get_grid_axes_dd`, with the same layout as
+    `newton.newton.get_starting_grid`.
+    '''
+    shape = (y[0].size, x[0].size)
+    re = tuple(np.broadcast_to(a[None,:], shape).copy() for a in x)
+    im = tuple(np.broadcast_to(a[:,None], shape).copy() for a in y)
+    return re, im
+
+
+#######
+#
+#    DOUBLE-DOUBLE NEWTON-RAPHSON METHOD
+#
+##########################################################################
+
+def nr_delta_dd(P, Z):
+    '''
+    Calculate the P(Z)/P'(Z) Newton-Raphson correction of a polynomial
+    at complex double-double value(s) Z.
+    '''
+    zero = np.zeros_like(Z[0][0])
+    p = ((P.coeff[0] + zero, zero), (zero, zero))
+    dp = ((zero, zero), (zero, zero))
+    for c in P.coeff[1:]:
+        dp = ddc_mul(dp, Z)
+        dp = (dd_add(dp[0], p[0]), dd_add(dp[1], p[1]))
+        p = ddc_mul(p, Z)
+        p = (dd_add(p[0], (c, 0.0)), p[1])
+    return ddc_div(p, dp)
+
+def nr_basins_dd(P, Z, N=20, tol=None, root_tol=None, h=None, switch=1e-10):
+    '''
+    Double-double version of `newton.newton.nr_basins`.
+
+    Every point is iterated in double-double precision only until it is
+    resolved in float64: the separation of neighbouring points, `h`,
+    is propagated through the derivative of the Newton-Raphson map and
+    once it exceeds `switch`, the point continues in float64. Since the
+    iteration pulls neighbouring points apart quickly everywhere except
+    close to the roots, only the first few steps are done in the slow
+    arithmetic.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    Z : complex double-double array
+        Starting points of the iteration, e.g. from
+        `get_starting_grid_dd`.
+    N : int, default=20
+        (Maximum) number of iterations to take.
+    tol, root_tol : float, optional
+        See `newton.newton.nr_basins`.
+    h : float, optional
+        Separation of neighbouring points. If not given, the points are
+        iterated in double-double precision all the way.
+    switch : float, default=1e-10
+        Separation above which a point continues in float64. Lower
+        values switch earlier, which is faster, but points whose
+        separation is still close to the float64 resolution can end up
+        in the wrong basin. On 2.5e-15 wide views of basin boundaries,
+        1e-12 saves about a third of the time and misclassifies a few
+        pixels, while 1e-10 gives the same result as pure
+        double-double.
+
+    Returns
+    -------
+    idx : np.ndarray
+        Root index of every point.
+    n_iter : np.ndarray or None
+        Number of iterations taken by every point, if `tol` is given.
+    '''
+    (rh, rl), (ih, il) = ((np.array(a, dtype=float).ravel() for a in z)
+                          for z in Z)
+    shape = np.shape(Z[0][0])
+    tol_ = 0.0 if tol is None else tol
+
+    X = np.empty(rh.size, dtype=complex)
+    n_iter = np.full(rh.size, N, dtype=np.min_scalar_type(N))
+    active = np.arange(rh.size)
+    D = np.full(rh.size, 0.0 if h is None else h)
+    for i in range(N):
+        if h is not None:
+            # |N'(z)| = |P(z) P''(z) / P'(z)^2|, in float64 is enough
+            F = P.evaln(rh + 1j*ih, 2)
+            D *= np.abs(F[0] * F[2] / F[1]**2)
+
+        dz = nr_delta_dd(P, ((rh, rl), (ih, il)))
+        rh, rl = dd_sub((rh, rl), dz[0])
+        ih, il = dd_sub((ih, il), dz[1])
+
+        done = np.hypot(dz[0][0], dz[1][0]) < tol_
+        n_iter[active[done]] = i + 1
+        done |= ~(np.isfinite(rh) & np.isfinite(ih))
+
+        # Continue in float64 with the points that are resolved already
+        resolved = ~done & (D > switch)
+        if resolved.any():
+            X_r, n_r = nr_converge(P, rh[resolved] + 1j*ih[resolved],
+                                   N - i - 1, tol=tol_)
+            X[active[resolved]] = X_r
+            n_r = n_r.astype(n_iter.dtype)
+            n_iter[active[resolved]] = np.where(n_r < N - i - 1, n_r + i + 1, N)
+            done |= resolved
+
+        if done.any():
+            X[active[done & ~resolved]] = (rh + 1j*ih)[done & ~resolved]
+            keep = ~done
+            active, D = active[keep], D[keep]
+            rh, rl, ih, il = rh[keep], rl[keep], ih[keep], il[keep]
+        if active.size == 0:
+            break
+    X[active] = rh + 1j*ih
+
+    idx = nr_classify(P, X.reshape(shape), root_tol=root_tol)
+    return idx, (None if tol is None else n_iter.reshape(shape))
+
+def nr_render_dd(P, Z, n_steps, lut, tol=None, root_tol=None, h=None,
+                 switch=1e-10, stats=None):
+    '''
+    Double-double version of `newton.newton.nr_render`.
+    '''
+    idx, n_iter = nr_basins_dd(P, Z, n_steps, tol=tol, root_tol=root_tol, h=h,
+                               switch=switch)
+    if stats is not None:
+        stats.update(idx, n_iter)
+    return nr_lut_colors(lut, idx, n_iter=n_iter, n_max=n_steps)
@@ -1,3 +1,4 @@
+import os
 import numpy as np
 
 import seaborn as sns
@@ -5,6 +6,7 @@ import matplotlib.cm as cm
 import matplotlib.pyplot as plt
 
 from .newton import *
+from .instrument import NULL_PROFILER
 
 from ._util import NR_complex_fig_setup
 
@@ -19,8 +21,7 @@ def NR_colored_roots(ax, P, alpha=0.8):
   roots = P.roots()
 
   # Get different colors for different roots
-  cmap = get_cmap()
-  colors = cmap(np.linspace(0,1,len(P.coeff_())-1))
+  colors = cm.viridis(np.linspace(0,1,len(roots)))
 
   # Plot roots on a real or complex plane
   ax.scatter(x=roots.real,
@@ -38,7 +39,7 @@ def NR_fractal_ax(ax, X,
                   P=None, X_c=None):
 
   if (P is not None) & (X_c is not None):
-    colors = get_NR_colors(P, X_c)
+    colors = nr_colors(P, X_c).reshape(-1, 4)
   else:
     colors = 'gray'
 
@@ -63,7 +64,7 @@ def NR_fractal_steps_gray(P, N=10,
     _ = NR_fractal_ax(axes[0], X=X_0)
 
     for i in range(1, len(axes)):
-        X_1 = NR_iter(P, X_0, steps[i-1])
+        X_1 = nr_iter(P, X_0, steps[i-1])
         _ = NR_fractal_ax(axes[i], X=X_1)
         X_0 = X_1
 
@@ -87,7 +88,7 @@ def NR_fractal_steps_colored(P, N=10,
     _ = NR_fractal_ax(axes[0], X=X_0, P=P, X_c=X_0)
 
     for i in range(1, len(axes)):
-        X_1 = NR_iter(P, X_0, steps[i-1])
+        X_1 = nr_iter(P, X_0, steps[i-1])
         _ = NR_fractal_ax(axes[i], X=X_1, P=P, X_c=X_1)
         X_0 = X_1
 
@@ -109,7 +110,7 @@ def NR_fractal_steps_reversed(P, N=100,
     ax = NR_fractal_ax(axes[0], X=X_0, P=P, X_c=X_0)
 
     for i in range(1, len(axes)):
-        X_N = NR_iter(P, X_0, steps[i-1])
+        X_N = nr_iter(P, X_0, steps[i-1])
         ax = NR_fractal_ax(axes[i], X=X_0, P=P, X_c=X_N)
 
     fig.suptitle('Fig. 8. Newton$-$Raphson fractal on a grid of points',
@@ -121,12 +122,7 @@ def NR_fractal_steps_reversed(P, N=100,
 def NR_fractal_image_ax(ax, P, X_c,
                         grid_lim_x, grid_lim_y):
 
-    colors = get_NR_colors(P, X_c)
-    X = np.array(colors.reshape((int(np.sqrt(len(colors))),
-                                 int(np.sqrt(len(colors))),
-                                 4
-                                ))
-                )
+    X = nr_rgba(P, X_c)
     ax.imshow(X, extent=(*grid_lim_x, *grid_lim_y))
     return ax
 
@@ -146,7 +142,7 @@ def NR_fractal_steps_image(P, N=100,
                              grid_lim_x=grid_lim, grid_lim_y=grid_lim)
 
     for i in range(1, len(axes)):
-        X_N = NR_iter(P, X_0, steps[i-1])
+        X_N = nr_iter(P, X_0, steps[i-1])
         ax = NR_fractal_image_ax(axes[i], P=P, X_c=X_N,
                                  grid_lim_x=grid_lim, grid_lim_y=grid_lim)
 
@@ -162,7 +158,7 @@ def NR_fractal_plot(P, N=512, n_steps=10,
                                      grid_lim=grid_lim, axis=False)
 
     X_0 = get_starting_grid(N, grid_lim, grid_lim)
-    X_N = NR_iter(P, X_0, n_steps)
+    X_N = nr_iter(P, X_0, n_steps)
     ax = NR_fractal_image_ax(ax=axes[0], P=P, X_c=X_N,
                              grid_lim_x=grid_lim, grid_lim_y=grid_lim)
 
@@ -176,30 +172,49 @@ def NR_fractal(P,
                grid_lim_x=None,
                grid_lim_y=None,
                axis=True, show=True,
-               save=False, savedir='./out/'):
+               save=False, savedir='./out/',
+               cmap=cm.viridis, tol=None, n_shades=1, cache=None,
+               method='newton', relax=1.0, quadtree=False, profiler=None,
+               stats=None):
 
     if grid_lim_x is None: grid_lim_x = NR_missing_grid_lim(P)
     if grid_lim_y is None: grid_lim_y = NR_missing_grid_lim(P)
 
-    fig, ax = plt.subplots(nrows=1, ncols=1, figsize=figsize)
-    ax.set_aspect('equal')
-    if not axis:
-        ax.axis('off')
-
-    X_0 = get_starting_grid(N, grid_lim_x, grid_lim_y[::-1])
-    X_N = NR_iter(P, X_0, n_steps)
-    ax = NR_fractal_image_ax(ax=ax, P=P, X_c=X_N,
-                             grid_lim_x=grid_lim_x, grid_lim_y=grid_lim_y)
-
     gxl, gxr = grid_lim_x
     gyl, gyr = grid_lim_y
-    fname = f'nrfractal|N{N}|ns{n_steps}|x{gxl}_{gxr}|y{gyl}_{gyr}.'
-    if save:
-        os.makedirs(savedir, exist_ok=True)
-        plt.savefig(savedir + fname + figsave_fmt,
-                    format=figsave_fmt,
-                    dpi=figsave_dpi,
-                    bbox_inches='tight')
+    cname = getattr(cmap, 'name', cmap)
+    fname = f'nrfractal|N{N}|ns{n_steps}|x{gxl}_{gxr}|y{gyl}_{gyr}|{cname}.'
+    if (method != 'newton') or (relax != 1):
+        fname = fname[:-1] + f'|{method}{relax}.'
+    if tol is not None:
+        fname = fname[:-1] + f'|tol{tol}.'
+    if n_shades != 1:
+        fname = fname[:-1] + f'|sh{n_shades}.'
+    if quadtree:
+        fname = fname[:-1] + '|qt.'
+
+    prof = profiler or NULL_PROFILER
+    with prof.stage('NR_fractal'):
+        fig, ax = plt.subplots(nrows=1, ncols=1, figsize=figsize)
+        ax.set_aspect('equal')
+        if not axis:
+            ax.axis('off')
+
+        # Root indices are served from the cache if they were computed before
+        X = nr_image(P, N, n_steps, grid_lim_x, grid_lim_y,
+                     cmap=cmap, tol=tol, n_shades=n_shades, cache=cache,
+                     method=method, relax=relax, quadtree=quadtree,
+                     profiler=profiler, stats=stats)
+        with prof.stage('imshow'):
+            ax.imshow(X, extent=(*grid_lim_x, *grid_lim_y))
+
+        if save:
+            os.makedirs(savedir, exist_ok=True)
+            with prof.stage('savefig', dpi=figsave_dpi):
+                plt.savefig(savedir + fname + figsave_fmt,
+                            format=figsave_fmt,
+                            dpi=figsave_dpi,
+                            bbox_inches='tight')
 
     if show:
         plt.show()
@@ -0,0 +1,179 @@
+'''
+Opt-in per-stage instrumentation of the renders.
+
+A `Profiler` passed to the entry points (`nr_grid_basins`, `nr_image`,
+`nr_image_tiled`, `NR_fractal`) records the wall time, CPU time, peak
+allocated bytes and pixel-iteration throughput of every stage of the
+render. The records are kept on the profiler and forwarded to its hooks,
+which are callables taking a single record, e.g. a `JSONLinesSink`.
+'''
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Profiler:
+    '''
+    Collect timing and memory records of the stages of a render.
+
+    Parameters
+    ----------
+    hooks : iterable of callables, optional
+        Called with every record once its stage finished.
+    trace_memory : bool, default=True
+        Measure the peak allocated bytes with `tracemalloc`. Tracing
+        slows down the allocations, so it can be turned off when only
+        the timings are of interest.
+    **tags
+        Extra fields added to every record, e.g. the name of a batch run.
+
+    Attributes
+    ----------
+    records : list of dict
+        Records of the finished stages, in the order they finished. Every
+        record has the fields:
+
+        stage : str
+            Name of the stage, prefixed by the names of the enclosing
+            stages, e.g. `'nr_image/basins/iterate'`.
+        wall, cpu : float
+            Wall and CPU time of the stage in seconds.
+        peak_bytes : int or None
+            Peak memory allocated during the stage, on top of the memory
+            allocated when it started.
+        pixel_iterations : int or None
+            Number of pixel-iterations done by the stage, if known.
+        throughput : float or None
+            Pixel-iterations per second of wall time.
+    '''
+    def __init__(self, hooks=(), trace_memory=True, **tags):
+        self.hooks = list(hooks)
+        self.trace_memory = trace_memory
+        self.tags = tags
+        self.records = []
+        self._stack = []
+        self._tracing = False
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    @contextmanager
+    def stage(self, name, **fields):
+        '''
+        Measure the stage of a render run inside the `with` block.
+
+        The yielded record can be updated inside the block, e.g. with the
+        `pixel_iterations` of the stage, which are only known at its end.
+        '''
+        if self.trace_memory and not self._stack and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        trace = self.trace_memory and tracemalloc.is_tracing()
+
+        if trace:
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the peak of the enclosing stage, before resetting it
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        frame = {'base' : current, 'peak' : current}
+        path = '/'.join([f['name'] for f in self._stack] + [name])
+        frame['name'] = name
+        self._stack.append(frame)
+
+        record = {'stage' : path, 'pixel_iterations' : None, **fields}
+        t_wall, t_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            wall = time.perf_counter() - t_wall
+            cpu = time.process_time() - t_cpu
+            self._stack.pop()
+
+            peak_bytes = None
+            if trace:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(frame['peak'], peak)
+                peak_bytes = peak - frame['base']
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            if self._tracing and not self._stack:
+                tracemalloc.stop()
+                self._tracing = False
+
+            n = record['pixel_iterations']
+            record.update(wall=wall, cpu=cpu, peak_bytes=peak_bytes,
+                          throughput=(None if n is None or wall == 0
+                                      else n / wall))
+            record.update(self.tags)
+            self._emit(record)
+
+    def _emit(self, record):
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+    def summary(self):
+        '''
+        Sum the wall and CPU times and pixel-iterations, and take the
+        maximum of the peak bytes of the records of every stage.
+
+        Returns
+        -------
+        dict
+            Aggregated record of every stage, keyed by the stage name.
+        '''
+        out = {}
+        for r in self.records:
+            s = out.setdefault(r['stage'], {'count' : 0, 'wall' : 0.0,
+                                            'cpu' : 0.0, 'peak_bytes' : None,
+                                            'pixel_iterations' : None})
+            s['count'] += 1
+            s['wall'] += r['wall']
+            s['cpu'] += r['cpu']
+            if r['peak_bytes'] is not None:
+                s['peak_bytes'] = max(s['peak_bytes'] or 0, r['peak_bytes'])
+            if r['pixel_iterations'] is not None:
+                s['pixel_iterations'] = ((s['pixel_iterations'] or 0)
+                                         + r['pixel_iterations'])
+        for s in out.values():
+            n = s['pixel_iterations']
+            s['throughput'] = None if n is None or s['wall'] == 0 else n / s['wall']
+        return out
+
+
+class _NullProfiler:
+    '''
+    Stand-in used by the entry points when no profiler is given.
+    '''
+    @contextmanager
+    def stage(self, name, **fields):
+        yield {}
+
+NULL_PROFILER = _NullProfiler()
+
+
+class JSONLinesSink:
+    '''
+    Hook appending every record as a line of JSON to a file.
+
+    Parameters
+    ----------
+    fname : str
+        Path of the file to append the records to.
+    '''
+    def __init__(self, fname):
+        self.fname = fname
+
+    def __call__(self, record):
+        with open(self.fname, 'a') as f:
+            f.write(json.dumps(record, default=_to_builtin) + '\n')
+
+def _to_builtin(obj):
+    # numpy scalars in the user supplied fields
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
@@ -1,5 +1,9 @@
 import numpy as np
-from functools import reduce
+from math import comb
+from itertools import product
+from functools import partial
+
+from .instrument import NULL_PROFILER
 
 
 #######
@@ -8,7 +12,106 @@ from functools import reduce
 #
 ##########################################################################
 
-def nr_step(P, X):
+def nr_delta(P, X, out=None):
+    '''
+    Calculate the P(X)/P'(X) Newton-Raphson correction of a polynomial
+    at given X value(s), with the polynomial and its derivative
+    evaluated in a single pass.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    X : float or array-like
+        A value or an array of values to evaluate the input polynomial
+        at.
+    out : np.ndarray, optional
+        Preallocated buffer of shape `(2, *X.shape)` for the evaluation
+        of P and P'. The correction is returned as a view into `out[0]`.
+    '''
+    F = P.evaln(X, 1, out=out)
+    F[0] /= F[1]
+    return F[0]
+
+def nr_delta_halley(P, X, out=None):
+    '''
+    Calculate the 2PP'/(2P'^2 - PP'') correction of Halley's method of
+    a polynomial at given X value(s). See `nr_delta` for the parameters,
+    but `out` has to have the shape `(3, *X.shape)`.
+    '''
+    F = P.evaln(X, 2, out=out)
+    F[2] *= F[0]
+    F[0] *= F[1]
+    F[1] *= F[1]
+    F[1] *= 2
+    F[1] -= F[2]
+    F[0] *= 2
+    F[0] /= F[1]
+    return F[0]
+
+def nr_delta_householder(P, X, order=3, out=None):
+    '''
+    Calculate the correction of Householder's method of a given order
+    of a polynomial at given X value(s), which is
+
+        -order * (1/P)^(order-1) / (1/P)^(order)
+
+    Order 1 is the Newton-Raphson, order 2 is Halley's method. See
+    `nr_delta` for the parameters, but `out` has to have the shape
+    `(order+1, *X.shape)`.
+    '''
+    F = P.evaln(X, order, out=out)
+
+    # The derivatives of 1/P follow from the derivatives of (1/P) * P = 1.
+    # They are calculated as G[k] = P^(k+1) * (1/P)^(k), which does not
+    # divide by P, so the correction P * G[order-1] / G[order] is finite
+    # near and zero on the roots.
+    G = np.empty((order+1, *F.shape[1:]), dtype=F.dtype)
+    P_pow = np.ones_like(G)
+    for j in range(1, order):
+        P_pow[j] = P_pow[j-1] * F[0]
+    G[0] = 1
+    for k in range(1, order+1):
+        G[k] = 0
+        for j in range(1, k+1):
+            G[k] -= comb(k, j) * F[j] * G[k-j] * P_pow[j-1]
+
+    F[0] *= G[order-1]
+    F[0] /= G[order]
+    F[0] *= -order
+    return F[0]
+
+def nr_method(method='newton'):
+    '''
+    Get the correction function of an iteration engine and the number of
+    derivatives it needs.
+
+    Parameters
+    ----------
+    method : str, default='newton'
+        Name of the engine: `'newton'`, `'halley'` or `'householder<k>'`
+        for Householder's method of order k >= 1 (e.g. `'householder3'`).
+
+    Returns
+    -------
+    n : int
+        Number of derivatives needed, i.e. the size of the evaluation
+        buffer is `(n+1, *X.shape)`.
+    delta : Callable
+        Function with the signature of `nr_delta`.
+    '''
+    if method == 'newton':
+        return 1, nr_delta
+    if method == 'halley':
+        return 2, nr_delta_halley
+    if method.startswith('householder') and method[11:].isdigit():
+        order = int(method[11:])
+        if order >= 1:
+            return order, partial(nr_delta_householder, order=order)
+    raise ValueError(f'Unknown iteration method: {method}')
+
+def nr_step(P, X, method='newton', relax=1.0):
     '''
     Calculate a single step of the Newton-Raphson iterative method on
     a polynomial, evaluated at given X value(s).
@@ -21,10 +124,16 @@ def nr_step(P, X):
     X : float or array-like
         A value or an array of values to evaluate the input polynomial
         at.
+    method : str, default='newton'
+        Iteration engine, see `nr_method`.
+    relax : float, default=1.0
+        Relaxation factor multiplying every step. Values other than 1
+        give the relaxed (damped) version of the method.
     '''
-    return X - P.eval(X)/P.evald(X, 1)
+    _, delta = nr_method(method)
+    return X - relax * delta(P, X)[()]
 
-def nr_iter(P, X, N=20):
+def nr_iter(P, X, N=20, method='newton', relax=1.0):
     '''
     Calculate multiple consecutive steps of the Newton-Raphson iterative
     method on a polynomial, evaluated at given X value(s).
@@ -39,8 +148,82 @@ def nr_iter(P, X, N=20):
         at.
     N : int, default=20
         Number of iteration to take.
+    method : str, default='newton'
+        Iteration engine, see `nr_method`.
+    relax : float, default=1.0
+        Relaxation factor multiplying every step.
     '''
-    return reduce(lambda x, _: nr_step(P, x), range(N), X)
+    n, delta = nr_method(method)
+    X = np.array(X)
+    X = X.astype(np.result_type(X, P.coeff), copy=False)
+    F = np.empty((n+1, *X.shape), dtype=X.dtype)
+    for _ in range(N):
+        dX = delta(P, X, out=F)
+        if relax != 1: dX *= relax
+        X -= dX
+    return X[()]
+
+def nr_converge(P, X, N=20, tol=1e-10, method='newton', relax=1.0):
+    '''
+    Iterate the Newton-Raphson method on a polynomial until every point
+    either converged or took `N` steps. Points are dropped from the
+    active set as soon as their step size falls below `tol`, so
+    converged points are not updated any further.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    X : float or array-like
+        A value or an array of values to evaluate the input polynomial
+        at.
+    N : int, default=20
+        Maximum number of iterations to take.
+    tol : float, default=1e-10
+        A point is considered converged when the absolute value of its
+        last Newton-Raphson step is smaller than this value.
+    method : str, default='newton'
+        Iteration engine, see `nr_method`.
+    relax : float, default=1.0
+        Relaxation factor multiplying every step.
+
+    Returns
+    -------
+    X : np.ndarray
+        Final position of the points, with the same shape as the input.
+    n_iter : np.ndarray
+        Number of steps taken by each point until convergence. Points
+        that did not converge in `N` steps have `N` as their value.
+    '''
+    n, delta = nr_method(method)
+    X = np.array(X)
+    X = X.astype(np.result_type(X, P.coeff, complex), copy=False)
+    shape = X.shape
+    X = X.ravel()
+    n_iter = np.full(X.size, N, dtype=np.min_scalar_type(N))
+
+    # Indices and positions of the points still being iterated
+    active = np.arange(X.size)
+    X_a = X.copy()
+    F = np.empty((n+1, X.size), dtype=X.dtype)
+    for i in range(N):
+        dX = delta(P, X_a, out=F[:,:active.size])
+        if relax != 1: dX *= relax
+        X_a -= dX
+
+        # Retire converged points and the ones that blew up (P'(x) = 0)
+        done = np.abs(dX) < tol
+        n_iter[active[done]] = i + 1
+        done |= ~np.isfinite(X_a)
+        if done.any():
+            X[active[done]] = X_a[done]
+            active, X_a = active[~done], X_a[~done]
+        if active.size == 0:
+            break
+    X[active] = X_a
+
+    return X.reshape(shape), n_iter.reshape(shape)
 
 
 #######
@@ -68,10 +251,55 @@ def get_even_points(N, limx, limy):
     (Nx, Ny) : tuple of ints
         The number of points along the X and Y dimension, respectively.
     '''
-    dx = (limx[1]-limx[0]) / (limy[1]-limy[0])
+    dx = abs(limx[1]-limx[0]) / abs(limy[1]-limy[0])
     Nx, Ny = int(round(N * max(dx, 1))), int(round(N * max(1/dx, 1)))
     return Nx, Ny
 
+def get_grid_axes(N, limx, limy):
+    '''
+    Get the coordinates of the points along the X and Y dimensions of
+    an evenly distributed 2D grid.
+
+    Parameters
+    ----------
+    N : float
+        Approximate number of points along the shorter side of the grid.
+    limx : tuple
+        The left and right limits of the border along the X dimension.
+    limy : tuple
+        The left and right limits of the border along the Y dimension.
+
+    Returns
+    -------
+    (x, y) : tuple of np.ndarrays
+        The coordinates along the X and Y dimension, respectively.
+    '''
+    Nx, Ny = get_even_points(N, limx, limy)
+    return np.linspace(*limx, Nx), np.linspace(*limy, Ny)
+
+def get_starting_grid(N, limx, limy):
+    '''
+    Generate a grid of points on the Re-Im complex space in an arbitrary
+    box size. Rows of the grid run along the Y (imaginary) dimension,
+    columns along the X (real) dimension.
+
+    Parameters
+    ----------
+    N : float
+        Approximate number of points along the shorter side of the grid.
+    limx : tuple
+        The left and right limits of the border along the X dimension.
+    limy : tuple
+        The left and right limits of the border along the Y dimension.
+
+    Returns
+    -------
+    np.ndarray
+        Complex array of shape `(Ny, Nx)`.
+    '''
+    x, y = get_grid_axes(N, limx, limy)
+    return x[None,:] + 1j*y[:,None]
+
 
 #######
 #
@@ -79,14 +307,67 @@ def get_even_points(N, limx, limy):
 #
 ##########################################################################
 
-def closest_roots(P, X):
+def closest_roots(P, X, tol=None):
+    '''
+    Find the index of the closest root of a polynomial to given X
+    value(s). The roots are visited one by one while keeping a running
+    minimum of the distances, so only a few buffers of the size of X
+    are allocated, regardless of the degree of the polynomial.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to get roots from.
+    X : float or array-like
+        A value or an array of values to classify.
+    tol : float, optional
+        If given, also return a mask flagging the values that are
+        farther than `tol` from every root, i.e. did not converge.
+
+    Returns
+    -------
+    idx : np.ndarray
+        Index of the closest root for every element of X, stored in the
+        smallest unsigned integer type that fits the number of roots
+        (uint8 for polynomials with degree up to 256).
+    far : np.ndarray of bools
+        Only returned if `tol` is given.
+    '''
+    roots = P.roots()
+    X = np.asarray(X)
+    X_re, X_im = X.real, X.imag
+
+    idx = np.zeros(X.shape, dtype=np.min_scalar_type(max(roots.size-1, 0)))
+    d_min = np.full(X.shape, np.inf)
+    d, t = np.empty(X.shape), np.empty(X.shape)
+    closer = np.empty(X.shape, dtype=bool)
+    for i, p in enumerate(roots):
+        # Squared distance |X - p|^2
+        np.subtract(X_re, p.real, out=d)
+        d *= d
+        np.subtract(X_im, p.imag, out=t)
+        t *= t
+        d += t
+
+        np.less(d, d_min, out=closer)
+        np.copyto(d_min, d, where=closer)
+        np.copyto(idx, i, where=closer)
+
+    if tol is None:
+        return idx[()]
+    return idx[()], (d_min > tol*tol)[()]
+
+def get_cmap(cmap):
     '''
-    Find the index of the closes root of a polynomial to a given X
-    value(s).
+    Get a colormap by its name. Matplotlib is only imported here, so the
+    rest of the module can be used without it.
     '''
-    return np.argmin([np.abs(X - p) for p in P.roots()], axis=0)
+    if isinstance(cmap, str):
+        from matplotlib import colormaps
+        return colormaps[cmap]
+    return cmap
 
-def nr_colors(P, X, cmap=cm.viridis):
+def nr_colors(P, X, cmap='viridis'):
     '''
     Generate a list of color values sampled from a colormap for a given
     X value(s).
@@ -97,9 +378,9 @@ def nr_colors(P, X, cmap=cm.viridis):
         A polynomial instance to get roots from.
     X : float or array-like
         A value or an array of values to get color values for.
-    cmap : Callable or `~matplotlib.colors.Colormap`, default 'viridis'
-        A colormap instance to sample values from or a function to get
-        color values from.
+    cmap : str, Callable or `~matplotlib.colors.Colormap`, default 'viridis'
+        Name of a matplotlib colormap, a colormap instance to sample
+        values from or a function to get color values from.
 
     Returns
     -------
@@ -107,7 +388,329 @@ def nr_colors(P, X, cmap=cm.viridis):
         A list of RGBA color values sampled from a given colormap, each
         corresponding to the element(s) in the input X.
     '''
-    return cmap((r:=closest_roots(P, X))/max(r))
+    cmap = get_cmap(cmap)
+    return cmap(closest_roots(P, X) / max(len(P.roots())-1, 1))
+
+def nr_basins(P, X, N=20, tol=None, root_tol=None, method='newton', relax=1.0,
+              profiler=None):
+    '''
+    Iterate the Newton-Raphson method on given X value(s) and classify
+    the resulting points by their closest root.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    X : float or array-like
+        Starting point(s) of the iteration.
+    N : int, default=20
+        (Maximum) number of iterations to take.
+    tol : float, optional
+        If given, iterate with `nr_converge` using this tolerance and
+        also return the number of iterations taken by each point.
+    root_tol : float, optional
+        If given, points that ended up farther than this from every root
+        get the index `len(P.roots())`, marking them as not converged.
+    method, relax : optional
+        Iteration engine and relaxation factor, see `nr_iter`.
+    profiler : newton.instrument.Profiler, optional
+        If given, the `'iterate'` and `'classify'` stages are recorded.
+
+    Returns
+    -------
+    idx : np.ndarray
+        Root index of every point.
+    n_iter : np.ndarray or None
+        Number of iterations taken by every point, if `tol` is given.
+    '''
+    prof = profiler or NULL_PROFILER
+    with prof.stage('iterate') as rec:
+        if tol is None:
+            X_N, n_iter = nr_iter(P, X, N, method=method, relax=relax), None
+            rec['pixel_iterations'] = np.size(X) * N
+        else:
+            X_N, n_iter = nr_converge(P, X, N, tol=tol, method=method, relax=relax)
+            rec['pixel_iterations'] = int(n_iter.sum(dtype=np.int64))
+
+    with prof.stage('classify') as rec:
+        idx = nr_classify(P, X_N, root_tol=root_tol)
+        rec['pixel_iterations'] = idx.size
+
+    return idx, n_iter
+
+def nr_classify(P, X, root_tol=None):
+    '''
+    Get the index of the closest root to the end points X of the
+    Newton-Raphson iteration. If `root_tol` is given, points farther
+    than this from every root get the index `len(P.roots())`, marking
+    them as not converged.
+    '''
+    if root_tol is None:
+        return closest_roots(P, X)
+
+    idx, far = closest_roots(P, X, tol=root_tol)
+    idx = idx.astype(np.min_scalar_type(len(P.roots())), copy=False)
+    idx[far] = len(P.roots())
+    return idx
+
+def nr_palette(n_roots, cmap='viridis', n_shades=1, shade=0.6,
+               nan_color=(0, 0, 0, 255)):
+    '''
+    Build a lookup table of uint8 RGBA colors for the basins of the
+    roots, optionally shaded by the number of iterations taken.
+
+    Parameters
+    ----------
+    n_roots : int
+        Number of roots of the polynomial.
+    cmap : str or `~matplotlib.colors.Colormap`, default 'viridis'
+        Colormap to sample the color of the roots from.
+    n_shades : int, default=1
+        Number of shades of every root color.
+    shade : float, default=0.6
+        Amount of darkening applied to the last shade, between 0 and 1.
+    nan_color : tuple, default=(0, 0, 0, 255)
+        Color of the points that did not converge to any root.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape `(n_roots+1, n_shades, 4)`. The last row holds
+        the color of the points that did not converge.
+    '''
+    cmap = get_cmap(cmap)
+    lut = np.empty((n_roots+1, n_shades, 4), dtype=np.uint8)
+    base = cmap(np.arange(n_roots) / max(n_roots-1, 1), bytes=True)
+    f = 1 - shade * np.arange(n_shades) / max(n_shades-1, 1)
+
+    lut[:-1,:,:3] = np.round(base[:,None,:3] * f[None,:,None])
+    lut[:-1,:,3] = base[:,None,3]
+    lut[-1] = nan_color
+    return lut
+
+def nr_lut_colors(lut, idx, n_iter=None, n_max=None):
+    '''
+    Map root indices (and iteration counts) to uint8 RGBA colors using
+    a lookup table generated by `nr_palette`, with a single gather.
+
+    Parameters
+    ----------
+    lut : np.ndarray
+        Lookup table of shape `(n_roots+1, n_shades, 4)`.
+    idx : np.ndarray
+        Root index of every point.
+    n_iter : np.ndarray, optional
+        Number of iterations taken by every point. Used to select the
+        shade of the color if the lookup table has multiple shades.
+    n_max : int, optional
+        Maximum number of iterations, mapped to the last shade. Defaults
+        to the maximum of `n_iter`.
+
+    Returns
+    -------
+    np.ndarray
+        Array of uint8 RGBA colors with shape `(*idx.shape, 4)`.
+    '''
+    n_shades = lut.shape[1]
+    k = np.multiply(idx, n_shades, dtype=np.intp)
+    if (n_iter is not None) and (n_shades > 1):
+        if n_max is None: n_max = max(int(np.max(n_iter)), 1)
+        s = np.multiply(n_iter, n_shades, dtype=np.intp)
+        s //= n_max + 1
+        k += s
+
+    return np.take(lut.reshape(-1, 4), k, axis=0)
+
+def nr_rgba(P, X, cmap='viridis'):
+    '''
+    Same as `nr_colors`, but the colors are returned as an array of
+    uint8 RGBA values with shape `(*X.shape, 4)`.
+    '''
+    return nr_lut_colors(nr_palette(len(P.roots()), cmap=cmap),
+                         closest_roots(P, X))
+
+def nr_render(P, X, n_steps, lut, tol=None, root_tol=None, profiler=None,
+              stats=None):
+    '''
+    Render starting points X of the Newton-Raphson method into uint8
+    RGBA colors using a lookup table generated by `nr_palette`. See
+    `nr_basins` for the description of the parameters, and
+    `nr_grid_basins` for `profiler` and `stats`.
+    '''
+    idx, n_iter = nr_basins(P, X, n_steps, tol=tol, root_tol=root_tol,
+                            profiler=profiler)
+    if stats is not None:
+        stats.update(idx, n_iter)
+    with (profiler or NULL_PROFILER).stage('color') as rec:
+        img = nr_lut_colors(lut, idx, n_iter=n_iter, n_max=n_steps)
+        rec['pixel_iterations'] = idx.size
+    return img
+
+def nr_grid_basins(P, N, n_steps, grid_lim_x, grid_lim_y,
+                   tol=None, root_tol=None, precision='auto', cache=None,
+                   method='newton', relax=1.0, quadtree=False, dd_switch=1e-10,
+                   profiler=None, stats=None):
+    '''
+    Get the root index (and iteration count) of every point of a grid.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    N : int
+        Approximate number of pixels along the shorter side of the grid.
+    n_steps : int
+        (Maximum) number of Newton-Raphson iterations to take.
+    grid_lim_x, grid_lim_y : tuple
+        Limits of the grid along the real and imaginary axes.
+    tol, root_tol : float, optional
+        See `nr_basins`.
+    precision : {'auto', 'float64', 'dd'}, default='auto'
+        Arithmetic used for the grid and the iteration. Double-double
+        (`'dd'`) arithmetic resolves zooms beyond float64 precision, see
+        `newton.ddouble`. With `'auto'` it is selected by the pixel
+        spacing.
+    cache : newton.cache.BasinCache, optional
+        If given, the results are looked up in and stored into it.
+    method, relax : optional
+        Iteration engine and relaxation factor, see `nr_iter`. The
+        double-double precision only supports the plain Newton-Raphson
+        method.
+    quadtree : bool, default=False
+        If True, only iterate the borders of blocks of the grid and fill
+        the blocks with a uniform border, see
+        `newton.quadtree.nr_basins_quadtree`. Only supported in float64
+        precision. When `tol` is given, every point is iterated with
+        `nr_converge` instead, which is faster than filling blocks by
+        their iteration counts.
+    dd_switch : float, default=1e-10
+        Separation of neighbouring points above which double-double
+        iteration continues in float64, see `newton.ddouble.nr_basins_dd`.
+    profiler : newton.instrument.Profiler, optional
+        If given, the stages of the computation are recorded into it.
+    stats : newton.stats.BasinStats, optional
+        If given, the statistics of the basins are accumulated into it.
+
+    Returns
+    -------
+    idx : np.ndarray
+        Root index of every point with shape `(Ny, Nx)`, the first row
+        corresponding to the upper limit of `grid_lim_y`.
+    n_iter : np.ndarray or None
+        Number of iterations taken by every point, if `tol` is given.
+    '''
+    prof = profiler or NULL_PROFILER
+    with prof.stage('nr_grid_basins'):
+        if precision == 'auto':
+            from .ddouble import nr_precision
+            precision = nr_precision(N, grid_lim_x, grid_lim_y)
+        if precision != 'dd':
+            # Limits given as strings or Decimals for deep zooms
+            grid_lim_x = tuple(float(l) for l in grid_lim_x)
+            grid_lim_y = tuple(float(l) for l in grid_lim_y)
+
+        if cache is not None:
+            with prof.stage('cache_get') as rec:
+                key = cache.key(P.coeff, N, n_steps, grid_lim_x, grid_lim_y,
+                                tol=tol, root_tol=root_tol, precision=precision,
+                                method=method, relax=relax, quadtree=quadtree,
+                                dd_switch=dd_switch)
+                hit = cache.get(key)
+                rec['hit'] = hit is not None
+            if hit is not None:
+                if stats is not None:
+                    stats.update(*hit)
+                return hit
+
+        if precision == 'dd':
+            if (method != 'newton') or (relax != 1):
+                raise ValueError('Double-double precision only supports the Newton-Raphson method.')
+            if quadtree:
+                raise ValueError('Double-double precision does not support quadtree rendering.')
+            from .ddouble import get_grid_axes_dd, get_starting_grid_dd, nr_basins_dd
+            with prof.stage('grid', precision='dd'):
+                (x, y), h = get_grid_axes_dd(N, grid_lim_x, grid_lim_y[::-1])
+                Z_0 = get_starting_grid_dd(x, y)
+            # The iteration and the classification are not separated here
+            with prof.stage('basins_dd') as rec:
+                idx, n_iter = nr_basins_dd(P, Z_0, n_steps,
+                                           tol=tol, root_tol=root_tol, h=h,
+                                           switch=dd_switch)
+                rec['pixel_iterations'] = (idx.size * n_steps if n_iter is None
+                                           else int(n_iter.sum(dtype=np.int64)))
+        elif quadtree and tol is None:
+            from .quadtree import nr_basins_quadtree
+            with prof.stage('quadtree'):
+                idx, n_iter = nr_basins_quadtree(P, N, n_steps, grid_lim_x,
+                                                 grid_lim_y, tol=tol,
+                                                 root_tol=root_tol,
+                                                 method=method, relax=relax)
+        else:
+            with prof.stage('grid', precision='float64'):
+                X_0 = get_starting_grid(N, grid_lim_x, grid_lim_y[::-1])
+            idx, n_iter = nr_basins(P, X_0, n_steps, tol=tol, root_tol=root_tol,
+                                    method=method, relax=relax, profiler=profiler)
+
+        if stats is not None:
+            with prof.stage('stats'):
+                stats.update(idx, n_iter)
+        if cache is not None:
+            with prof.stage('cache_put'):
+                cache.put(key, idx, n_iter)
+    return idx, n_iter
+
+def nr_image(P, N, n_steps, grid_lim_x, grid_lim_y, cmap='viridis',
+             tol=None, n_shades=1, root_tol=None, precision='auto',
+             cache=None, method='newton', relax=1.0, quadtree=False,
+             dd_switch=1e-10, profiler=None, stats=None):
+    '''
+    Render a Newton-Raphson fractal on a grid into a uint8 RGBA image.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    N : int
+        Approximate number of pixels along the shorter side of the image.
+    n_steps : int
+        (Maximum) number of Newton-Raphson iterations to take.
+    grid_lim_x, grid_lim_y : tuple
+        Limits of the rendered area along the real and imaginary axes.
+    cmap : str or `~matplotlib.colors.Colormap`, default 'viridis'
+        Colormap to color the basins of the roots with.
+    tol : float, optional
+        Convergence tolerance. If given, iteration stops early for the
+        converged points and colors are shaded by the iteration count.
+    n_shades : int, default=1
+        Number of shades per root color, see `nr_palette`.
+    root_tol : float, optional
+        Distance to the roots above which points are considered not
+        converged, see `nr_basins`.
+    precision, cache, method, relax, quadtree, dd_switch, profiler, stats : optional
+        See `nr_grid_basins`.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape `(Ny, Nx, 4)` with the first row corresponding to
+        the upper limit of `grid_lim_y`.
+    '''
+    prof = profiler or NULL_PROFILER
+    with prof.stage('nr_image'):
+        lut = nr_palette(len(P.roots()), cmap=cmap, n_shades=n_shades)
+        idx, n_iter = nr_grid_basins(P, N, n_steps, grid_lim_x, grid_lim_y,
+                                     tol=tol, root_tol=root_tol,
+                                     precision=precision, cache=cache,
+                                     method=method, relax=relax,
+                                     quadtree=quadtree, dd_switch=dd_switch,
+                                     profiler=profiler, stats=stats)
+        with prof.stage('color') as rec:
+            img = nr_lut_colors(lut, idx, n_iter=n_iter, n_max=n_steps)
+            rec['pixel_iterations'] = idx.size
+    return img
 
 
 #######
@@ -123,15 +726,112 @@ def NR_missing_grid_lim(P):
 
     return tuple((-lim, lim))
 
-def NR_fractal_get_frames(gl_s, gl_e, n=50):
+def NR_fractal_get_frames(gl_s, gl_e, n=50, geometric=False):
+    '''
+    Interpolate the corner vertices of the frames of a zoom animation
+    between a starting and an ending view.
 
+    Parameters
+    ----------
+    gl_s, gl_e : tuple
+        The `(grid_lim_x, grid_lim_y)` limits of the first and the last
+        frame.
+    n : int, default=50
+        Number of frames.
+    geometric : bool, default=False
+        If True, the size of the view shrinks geometrically between the
+        frames (i.e. every frame zooms by the same factor), with the
+        ending view staying at a fixed position on the screen. Otherwise
+        the corners are interpolated linearly.
+
+    Returns
+    -------
+    np.ndarray
+        The four corners of every frame with shape `(n, 4, 2)`.
+    '''
     v_s = np.array(list(product(*gl_s)))
     v_e = np.array(list(product(*gl_e)))
 
-    v_coords = np.linspace(v_s, v_e, n)
+    if not geometric:
+        return np.linspace(v_s, v_e, n)
+
+    # Width of the views along the X and Y dimensions
+    w_s = v_s[3] - v_s[0]
+    w_e = v_e[3] - v_e[0]
+    t = np.linspace(0, 1, n)[:,None]
+    w = w_s * (w_e / w_s)**t
+
+    # Fraction of the path left, measured in the size of the view
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f = (w - w_e) / (w_s - w_e)
+    f = np.where(w_s != w_e, f, 1 - t)
+    v_coords = v_e + (v_s - v_e) * f[:,None,:]
 
     return v_coords
 
+def NR_fractal_get_steps(grid_lims, n_min=20, n_per_decade=10, n_max=None):
+    '''
+    Get an iteration budget for every frame of a zoom animation, which
+    grows with the zoom depth relative to the first frame.
+
+    Parameters
+    ----------
+    grid_lims : tuple
+        The `(grid_lim_x, grid_lim_y)` limits of every frame.
+    n_min : int, default=20
+        Number of iterations in the first frame.
+    n_per_decade : int, default=10
+        Extra iterations for every order of magnitude of zoom.
+    n_max : int, optional
+        Upper limit of the number of iterations.
+
+    Returns
+    -------
+    np.ndarray of ints
+    '''
+    w = np.array([gl[0][1] - gl[0][0] for gl in grid_lims])
+    n_steps = n_min + np.ceil(n_per_decade * np.log10(w[0] / w)).astype(int)
+    n_steps = np.maximum(n_steps, n_min)
+    if n_max is not None:
+        n_steps = np.minimum(n_steps, n_max)
+    return n_steps
+
+def NR_fractal_next_steps(n_iter, n_steps, q=0.99, margin=1.5,
+                          n_min=5, n_max=None):
+    '''
+    Estimate the iteration budget of the next frame of an animation from
+    the iteration counts of the previous one, returned by `nr_converge`.
+
+    Parameters
+    ----------
+    n_iter : np.ndarray
+        Number of iterations taken by the points of the previous frame.
+    n_steps : int
+        Iteration budget of the previous frame.
+    q : float, default=0.99
+        Quantile of the iteration counts of the converged points, that
+        should converge in the next frame too.
+    margin : float, default=1.5
+        Factor applied to the quantile to leave some room for the
+        deepening of the zoom.
+    n_min : int, default=5
+        Lower limit of the number of iterations.
+    n_max : int, optional
+        Upper limit of the number of iterations.
+
+    Returns
+    -------
+    int
+    '''
+    converged = n_iter[n_iter < n_steps]
+    if converged.size < (1 - q) * n_iter.size:
+        # Most of the points ran out of iterations: double the budget
+        n_next = 2 * n_steps
+    else:
+        n_next = int(np.ceil(margin * np.quantile(converged, q)))
+    n_next = max(n_next, n_min)
+    return n_next if n_max is None else min(n_next, n_max)
+
 def NR_fractal_get_grid_lims(v_coords):
     # Shorten variable names
     v1, v2 = v_coords[:,0], v_coords[:,3]
@@ -0,0 +1,50 @@
+import zlib
+import struct
+from contextlib import nullcontext
+
+import numpy as np
+
+
+def _png_chunk(tag, data):
+    '''
+    Pack a single chunk of a PNG file.
+    '''
+    return (struct.pack('>I', len(data)) + tag + data +
+            struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+def write_png(fname, img, rows=256, level=6):
+    '''
+    Write an 8-bit RGB or RGBA image into a PNG file without going
+    through matplotlib. The image is compressed in bands of rows, so
+    memory-mapped images larger than the memory can be written too.
+
+    Parameters
+    ----------
+    fname : str or file-like
+        Path of the output file, or a binary file object to write into.
+    img : np.ndarray
+        Array of uint8 values with shape `(H, W, 3)` or `(H, W, 4)`.
+    rows : int, default=256
+        Number of rows to compress at once.
+    level : int, default=6
+        Compression level of zlib between 0 and 9.
+    '''
+    h, w, c = img.shape
+    color_type = {3 : 2, 4 : 6}[c]
+
+    with (nullcontext(fname) if hasattr(fname, 'write')
+          else open(fname, 'wb')) as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', w, h, 8,
+                                                color_type, 0, 0, 0)))
+        z = zlib.compressobj(level)
+        # Every scanline is prefixed with its filter type (0 = None)
+        band = np.zeros((rows, w*c + 1), dtype=np.uint8)
+        for r in range(0, h, rows):
+            n = min(rows, h - r)
+            band[:n,1:] = np.asarray(img[r:r+n], dtype=np.uint8).reshape(n, -1)
+            data = z.compress(band[:n].tobytes())
+            if data:
+                f.write(_png_chunk(b'IDAT', data))
+        f.write(_png_chunk(b'IDAT', z.flush()))
+        f.write(_png_chunk(b'IEND', b''))
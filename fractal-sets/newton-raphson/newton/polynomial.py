@@ -1,8 +1,9 @@
 import numpy as np
+from math import factorial
 
 class Polynomial():
 
-    def __init__(self, coeff):
+    def __init__(self, coeff, roots=None):
         '''
         Initialize a polynomial with given coefficients.
 
@@ -10,12 +11,15 @@ class Polynomial():
         -----------
         coeff : list or np.ndarray
             Coefficients of the polynomial, with the highest degree first.
+        roots : np.ndarray, optional
+            Precomputed roots of the polynomial.
         '''
         self._coeff = np.array(coeff, dtype=float)
         if np.all(self._coeff == 0):
             raise ValueError('Polynomial cannot have all coefficients as zero.')
         self._coeff = np.trim_zeros(self._coeff, 'f')
-        self._roots = None
+        self._roots = roots
+        self._dcoeff = {0 : self._coeff}
 
     @property
     def coeff(self):
@@ -23,20 +27,21 @@ class Polynomial():
 
     def _differentiate(self, n):
         '''
-        Calculate the coefficients of the n-th derivative.
+        Calculate the coefficients of the n-th derivative, if not
+        already done.
         '''
-        coeff = self._coeff
-        for _ in range(n):
+        if n < 0:
+            raise ValueError('Derivative order must be non-negative.')
+        if n not in self._dcoeff:
+            coeff = self._differentiate(n-1)
             degree = np.arange(coeff.size, 1, -1) - 1
-            coeff = coeff[:-1] * degree
-        return coeff
+            self._dcoeff[n] = coeff[:-1] * degree
+        return self._dcoeff[n]
 
     def derivative(self, n=1):
         '''
         Return the n-th derivative as a new Polynomial object.
         '''
-        if n < 0:
-            raise ValueError('Derivative order must be non-negative.')
         return Polynomial(self._differentiate(n))
 
     def eval(self, X):
@@ -50,7 +55,49 @@ class Polynomial():
         Evaluate the n-th derivative of the polynomial at given X
         value(s).
         '''
-        return np.polyval(self.derivative(n).coeff, X)
+        return np.polyval(self._differentiate(n), X)
+
+    def evaln(self, X, n=1, out=None):
+        '''
+        Evaluate the polynomial and its first n derivatives together at
+        given X value(s), using a single Horner pass over the
+        coefficients.
+
+        Parameters
+        ----------
+        X : float or array-like
+            A value or an array of values to evaluate the polynomial at.
+        n : int, default=1
+            Highest order of derivative to evaluate.
+        out : np.ndarray, optional
+            Preallocated output buffer of shape `(n+1, *X.shape)`. The
+            results are written into it in place.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape `(n+1, *X.shape)`, where the k-th element is
+            the k-th derivative of the polynomial evaluated at X.
+        '''
+        if n < 0:
+            raise ValueError('Derivative order must be non-negative.')
+        X = np.asarray(X)
+        if out is None:
+            out = np.empty((n+1, *X.shape), dtype=np.result_type(X, self._coeff))
+
+        # Horner's scheme for the Taylor coefficients P^(k)(X) / k!
+        out[0] = self._coeff[0]
+        out[1:] = 0
+        for c in self._coeff[1:]:
+            for k in range(n, 0, -1):
+                out[k] *= X
+                out[k] += out[k-1]
+            out[0] *= X
+            out[0] += c
+
+        for k in range(2, n+1):
+            out[k] *= factorial(k)
+        return out
 
     def roots(self):
         '''
@@ -88,4 +135,4 @@ class Polynomial():
         '''
         String representation of an n-th derivative of the polynomial.
         '''
-        return self._get_poly_string(self.derivative(n).coeff)
\ No newline at end of file
+        return self._get_poly_string(self._differentiate(n))
\ No newline at end of file
@@ -0,0 +1,141 @@
+import numpy as np
+
+from .newton import get_grid_axes, nr_basins
+
+
+def _ranges(start, stop):
+    '''
+    Concatenate the ranges [start[i], stop[i]) into a single array.
+    '''
+    n = stop - start
+    return np.arange(n.sum()) + np.repeat(start - np.cumsum(n) + n, n)
+
+def _block_edges(r0, r1, c0, c1):
+    '''
+    Get the row and column indices of the pixels on the top, bottom,
+    left and right edges of blocks spanning rows [r0, r1) and columns
+    [c0, c1), together with the offsets of the blocks in them.
+    '''
+    w, h = c1 - c0, r1 - r0
+    cols, rows = _ranges(c0, c1), _ranges(r0, r1)
+    edges = ((np.repeat(r0, w), cols), (np.repeat(r1-1, w), cols),
+             (rows, np.repeat(c0, h)), (rows, np.repeat(c1-1, h)))
+    offsets = (np.cumsum(w) - w, np.cumsum(w) - w,
+               np.cumsum(h) - h, np.cumsum(h) - h)
+    return edges, offsets
+
+def nr_basins_quadtree(P, N, n_steps, grid_lim_x, grid_lim_y,
+                       tol=None, root_tol=None, method='newton', relax=1.0,
+                       block=64, min_block=4, exact=False):
+    '''
+    Get the root index (and iteration count) of every pixel of a
+    Newton-Raphson fractal, by only iterating the pixels on the border
+    of blocks of the image. Blocks whose whole border converges to the
+    same root (in the same number of iterations, if `tol` is given) are
+    filled with it, the others are recursively split into four, until
+    they are smaller than `min_block`, when all of their pixels are
+    iterated (Mariani-Silver algorithm).
+
+    Filling is exact as long as the sampled border does not miss a thin
+    component of another basin crossing it: the Fatou components of a
+    polynomial's Newton map are simply connected, so a closed curve
+    inside one basin component only encloses points of the same basin.
+    With `tol`, the iteration counts rarely agree along a whole border,
+    so few blocks are filled, and it is slower than iterating every
+    pixel with early stopping (1.6 s against 1.2 s with `exact=True` at
+    N=2048, 50 steps). `newton.newton.nr_grid_basins` does not use it
+    with `tol`.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    N : int
+        Approximate number of pixels along the shorter side of the image.
+    n_steps : int
+        (Maximum) number of Newton-Raphson iterations to take.
+    grid_lim_x, grid_lim_y : tuple
+        Limits of the rendered area along the real and imaginary axes.
+    tol, root_tol, method, relax : optional
+        See `newton.newton.nr_basins`.
+    block : int, default=64
+        Size of the initial blocks.
+    min_block : int, default=4
+        Blocks with a side not larger than this are iterated fully.
+    exact : bool, default=False
+        If True, iterate every pixel instead, for verification.
+
+    Returns
+    -------
+    idx : np.ndarray
+        Root index of every pixel with shape `(Ny, Nx)`, with the first
+        row corresponding to the upper limit of `grid_lim_y`.
+    n_iter : np.ndarray or None
+        Number of iterations taken by every pixel, if `tol` is given.
+    '''
+    x, y = get_grid_axes(N, grid_lim_x, grid_lim_y[::-1])
+    if exact:
+        return nr_basins(P, x[None,:] + 1j*y[:,None], n_steps, tol=tol,
+                         root_tol=root_tol, method=method, relax=relax)
+
+    n_roots = len(P.roots())
+    idx = np.zeros((y.size, x.size), dtype=np.min_scalar_type(n_roots))
+    n_iter = (None if tol is None else
+              np.zeros((y.size, x.size), dtype=np.min_scalar_type(n_steps)))
+    known = np.zeros((y.size, x.size), dtype=bool)
+
+    def compute(rows, cols):
+        # Iterate the given pixels, if they are not known already
+        new = ~known[rows, cols]
+        flat = np.unique(rows[new] * x.size + cols[new])
+        rows, cols = np.divmod(flat, x.size)
+        idx[rows, cols], n = nr_basins(P, x[cols] + 1j*y[rows], n_steps,
+                                       tol=tol, root_tol=root_tol,
+                                       method=method, relax=relax)
+        if n_iter is not None:
+            n_iter[rows, cols] = n
+        known[rows, cols] = True
+
+    def value(rows, cols):
+        # Pixels are equal, if they have the same root and iteration count
+        v = idx[rows, cols].astype(np.int64)
+        if n_iter is not None:
+            v += (n_roots + 1) * n_iter[rows, cols].astype(np.int64)
+        return v
+
+    r0, c0 = [a.ravel() for a in np.mgrid[0:y.size:block,0:x.size:block]]
+    r1, c1 = np.minimum(r0 + block, y.size), np.minimum(c0 + block, x.size)
+    while r0.size:
+        edges, offsets = _block_edges(r0, r1, c0, c1)
+        compute(*map(np.concatenate, zip(*edges)))
+
+        # A block is uniform if its edges have the same min and max value
+        v = value(r0, c0)
+        uniform = np.ones(r0.size, dtype=bool)
+        for e, o in zip(edges, offsets):
+            values = value(*e)
+            uniform &= np.minimum.reduceat(values, o) == v
+            uniform &= np.maximum.reduceat(values, o) == v
+        for b in np.flatnonzero(uniform):
+            idx[r0[b]:r1[b],c0[b]:c1[b]] = idx[r0[b],c0[b]]
+            if n_iter is not None:
+                n_iter[r0[b]:r1[b],c0[b]:c1[b]] = n_iter[r0[b],c0[b]]
+
+        # Iterate every pixel of the small blocks, which can be long
+        # strips at the edges of the image
+        small = ~uniform & (np.minimum(r1 - r0, c1 - c0) <= min_block)
+        if small.any():
+            h, w = r1[small] - r0[small], c1[small] - c0[small]
+            rows = np.repeat(_ranges(r0[small], r1[small]), np.repeat(w, h))
+            cols = _ranges(np.repeat(c0[small], h), np.repeat(c1[small], h))
+            compute(rows, cols)
+
+        # Split the rest of the blocks into four
+        split = ~uniform & ~small
+        r0, r1, c0, c1 = r0[split], r1[split], c0[split], c1[split]
+        rm, cm = (r0 + r1) // 2, (c0 + c1) // 2
+        r0, r1 = np.concatenate((r0, r0, rm, rm)), np.concatenate((rm, rm, r1, r1))
+        c0, c1 = np.concatenate((c0, cm, c0, cm)), np.concatenate((cm, c1, cm, c1))
+
+    return idx, n_iter
@@ -0,0 +1,415 @@
+import io
+import json
+import math
+import select
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+from .newton import nr_palette, NR_missing_grid_lim
+from .tiled import nr_render_block
+from .png import write_png
+
+
+#######
+#
+#    TILE GEOMETRY
+#
+##########################################################################
+
+def tile_lims(z, x, y, extent, size=256):
+    '''
+    Get the limits of the pixel centers of an XYZ tile.
+
+    Parameters
+    ----------
+    z, x, y : int
+        Zoom level and column and row index of the tile. The single tile
+        of zoom level 0 covers `extent`, and every further level halves
+        the size of the tiles. Rows are counted downwards from the upper
+        limit of the imaginary axis. Indices outside of `extent` are
+        valid, and extend the plane in every direction.
+    extent : tuple
+        The `(grid_lim_x, grid_lim_y)` limits of the tile at zoom 0.
+    size : int, default=256
+        Number of pixels along the sides of the tiles.
+
+    Returns
+    -------
+    grid_lim_x, grid_lim_y : tuple
+        Limits of the centers of the first and last pixels of the tile,
+        along the real and imaginary axes.
+    '''
+    (x0, x1), (y0, y1) = extent
+    wx, wy = (x1 - x0) / 2**z, (y1 - y0) / 2**z
+    hx, hy = wx / size, wy / size
+    l, t = x0 + x * wx, y1 - y * wy
+    return (l + hx/2, l + wx - hx/2), (t - wy + hy/2, t - hy/2)
+
+def tile_steps(z, n_min=20, n_per_decade=10, n_max=None):
+    '''
+    Get the iteration budget of the tiles of a zoom level, which grows
+    with the zoom depth like the one of `newton.newton.NR_fractal_get_steps`.
+    '''
+    n_steps = n_min + math.ceil(n_per_decade * z * math.log10(2))
+    return n_steps if n_max is None else min(n_steps, n_max)
+
+
+#######
+#
+#    TILE WORKERS
+#
+##########################################################################
+
+# State of a worker process, set once by `_worker_init`
+_worker = {}
+
+def _worker_init(P, lut, tol, root_tol, extent, size, steps):
+    '''
+    Store the settings shared by every tile in a worker process, so
+    that tasks only have to carry the indices of the tile.
+    '''
+    _worker.update(P=P, lut=lut, tol=tol, root_tol=root_tol,
+                   extent=extent, size=size, steps=steps)
+
+def _worker_tile(z, x, y):
+    '''
+    Render a tile into a PNG file in memory.
+    '''
+    size = _worker['size']
+    grid_lim_x, grid_lim_y = tile_lims(z, x, y, _worker['extent'], size)
+    # Square tiles for any extent, unlike the grids of `nr_image_axes`
+    x = np.linspace(*grid_lim_x, size)
+    y = np.linspace(*grid_lim_y[::-1], size)
+    img = nr_render_block(_worker['P'], (x, y), 'float64', None,
+                          slice(None), slice(None),
+                          tile_steps(z, **_worker['steps']), _worker['lut'],
+                          tol=_worker['tol'], root_tol=_worker['root_tol'])
+
+    f = io.BytesIO()
+    write_png(f, img, level=1)
+    return f.getvalue()
+
+
+#######
+#
+#    TILE CACHE AND RENDERING
+#
+##########################################################################
+
+class TileCache:
+    '''
+    Thread-safe in-memory LRU cache of rendered tiles.
+
+    Parameters
+    ----------
+    max_tiles : int, default=4096
+        Maximum number of tiles kept in the cache.
+    '''
+    def __init__(self, max_tiles=4096):
+        self.max_tiles = max_tiles
+        self.hits = 0
+        self.misses = 0
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def get(self, key):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key, tile):
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+
+class TileRenderer:
+    '''
+    Render the XYZ tiles of a Newton-Raphson fractal in a pool of worker
+    processes, with an LRU cache in front of it.
+
+    Requests of the same tile share a single render. A tile that is not
+    requested by anyone anymore is dropped from the queue of the pool,
+    if its rendering has not started yet.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    n_jobs : int, default=1
+        Number of worker processes rendering the tiles.
+    cmap : str or `~matplotlib.colors.Colormap`, default 'viridis'
+        Colormap to color the basins of the roots with.
+    tol : float, optional, default=1e-10
+        Convergence tolerance, see `newton.newton.nr_image`.
+    n_shades : int, default=8
+        Number of shades per root color, see `newton.newton.nr_palette`.
+    root_tol : float, optional
+        See `newton.newton.nr_image`.
+    extent : tuple, optional
+        The `(grid_lim_x, grid_lim_y)` limits of the tile at zoom 0.
+        Defaults to a square around the roots of `P`.
+    size : int, default=256
+        Number of pixels along the sides of the tiles.
+    n_steps, n_per_decade, n_max : int, optional
+        Iteration budget of the tiles, see `tile_steps`.
+    max_zoom : int, default=44
+        Deepest zoom level served. Beyond it the limits of the tiles are
+        not representable in float64.
+    max_tiles : int, default=4096
+        Size of the tile cache.
+    '''
+    def __init__(self, P, n_jobs=1, cmap='viridis', tol=1e-10, n_shades=8,
+                 root_tol=None, extent=None, size=256,
+                 n_steps=20, n_per_decade=10, n_max=None,
+                 max_zoom=44, max_tiles=4096):
+        if extent is None:
+            extent = (NR_missing_grid_lim(P),) * 2
+        self.extent = extent
+        self.size = size
+        self.max_zoom = max_zoom
+        self.cache = TileCache(max_tiles)
+        self.cancelled = 0
+
+        lut = nr_palette(len(P.roots()), cmap=cmap, n_shades=n_shades)
+        steps = {'n_min' : n_steps, 'n_per_decade' : n_per_decade,
+                 'n_max' : n_max}
+        self.pool = ProcessPoolExecutor(max_workers=n_jobs,
+                                        initializer=_worker_init,
+                                        initargs=(P, lut, tol, root_tol,
+                                                  extent, size, steps))
+        # Tiles being rendered, with the number of requests waiting for
+        # them. Cancelling a future calls `_done` in the same thread.
+        self._pending = {}
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    def _done(self, key, future):
+        if future.cancelled():
+            self.cancelled += 1
+        elif future.exception() is None:
+            self.cache.put(key, future.result())
+        with self._lock:
+            if self._pending.get(key, (None,))[0] is future:
+                del self._pending[key]
+
+    def _release(self, key, future):
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None or entry[0] is not future:
+                return
+            entry[1] -= 1
+            # Only succeeds if the rendering has not started yet
+            if entry[1] == 0:
+                future.cancel()
+
+    def tile(self, z, x, y, cancelled=None, poll=0.05):
+        '''
+        Get a tile as PNG data, rendering it if it is not in the cache.
+
+        Parameters
+        ----------
+        z, x, y : int
+            Zoom level and column and row index of the tile.
+        cancelled : callable, optional
+            Polled while waiting for the tile. If it returns True, the
+            request is given up, e.g. because the tile scrolled out of
+            view and the client closed the connection.
+        poll : float, default=0.05
+            Time between two calls of `cancelled` in seconds.
+
+        Returns
+        -------
+        bytes or None
+            The PNG data of the tile, or None if the request was given up.
+        '''
+        if not 0 <= z <= self.max_zoom:
+            raise ValueError(f'Zoom level {z} is out of the range [0, {self.max_zoom}].')
+        key = (z, x, y)
+        if (tile := self.cache.get(key)) is not None:
+            return tile
+
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                future = self.pool.submit(_worker_tile, z, x, y)
+                entry = self._pending[key] = [future, 0]
+                future.add_done_callback(lambda f: self._done(key, f))
+            entry[1] += 1
+            future = entry[0]
+
+        try:
+            while True:
+                try:
+                    return future.result(timeout=poll)
+                except TimeoutError:
+                    if cancelled is not None and cancelled():
+                        return None
+        finally:
+            self._release(key, future)
+
+    def stats(self):
+        return {
+            'cached' : len(self.cache),
+            'hits' : self.cache.hits,
+            'misses' : self.cache.misses,
+            'pending' : len(self._pending),
+            'cancelled' : self.cancelled,
+        }
+
+
+#######
+#
+#    HTTP SERVER
+#
+##########################################################################
+
+VIEWER = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Newton-Raphson fractal</title>
+<link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css">
+<script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+<style>
+  html, body, #map { height: 100%; margin: 0; background: #000; }
+  #view { position: absolute; bottom: 0; left: 0; z-index: 1000; padding: 4px 8px;
+          background: rgba(255,255,255,0.85); font: 12px monospace; }
+</style>
+</head>
+<body>
+<div id="map"></div>
+<div id="view"></div>
+<script>
+  const EXTENT = __EXTENT__, SIZE = __SIZE__;
+  const map = L.map('map', {crs: L.CRS.Simple, minZoom: 0, maxZoom: __MAX_ZOOM__});
+  L.tileLayer('/tiles/{z}/{x}/{y}.png', {tileSize: SIZE, maxZoom: __MAX_ZOOM__,
+                                         keepBuffer: 0}).addTo(map);
+  map.setView([-SIZE/2, SIZE/2], 0);
+
+  // Pixel coordinates of zoom 0 to the complex plane
+  const re = p => EXTENT[0][0] + p.lng / SIZE * (EXTENT[0][1] - EXTENT[0][0]);
+  const im = p => EXTENT[1][1] + p.lat / SIZE * (EXTENT[1][1] - EXTENT[1][0]);
+  function show() {
+    const b = map.getBounds(), sw = b.getSouthWest(), ne = b.getNorthEast();
+    document.getElementById('view').textContent =
+      `zoom ${map.getZoom()}  gl = ((${re(sw)}, ${re(ne)}), (${im(sw)}, ${im(ne)}))`;
+  }
+  map.on('moveend', show);
+  show();
+</script>
+</body>
+</html>
+'''
+
+class TileRequestHandler(BaseHTTPRequestHandler):
+    '''
+    Serve the tiles of the `TileRenderer` of the server at
+    `/tiles/<z>/<x>/<y>.png`, the statistics of the renderer at `/stats`
+    and a map viewer at `/`, which shows the limits of the current view
+    to use as keyframes of an animation.
+    '''
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, body, content_type, code=200, cache=False):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if cache:
+            self.send_header('Cache-Control', 'max-age=86400')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _disconnected(self):
+        # A readable socket without any data means the client hung up
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and self.connection.recv(1, socket.MSG_PEEK) == b''
+        except OSError:
+            return True
+
+    def do_GET(self):
+        renderer = self.server.renderer
+        path = self.path.split('?')[0].strip('/').split('/')
+
+        if path == ['']:
+            body = (VIEWER.replace('__EXTENT__', json.dumps(renderer.extent))
+                          .replace('__SIZE__', str(renderer.size))
+                          .replace('__MAX_ZOOM__', str(renderer.max_zoom)))
+            return self._send(body.encode(), 'text/html; charset=utf-8')
+        if path == ['stats']:
+            return self._send(json.dumps(renderer.stats()).encode(),
+                              'application/json')
+
+        try:
+            assert len(path) == 4 and path[0] == 'tiles' and path[3].endswith('.png')
+            z, x, y = int(path[1]), int(path[2]), int(path[3][:-4])
+            tile = renderer.tile(z, x, y, cancelled=self._disconnected)
+        except (AssertionError, ValueError):
+            return self.send_error(404)
+
+        if tile is not None:
+            self._send(tile, 'image/png', cache=True)
+
+class TileServer(ThreadingHTTPServer):
+    '''
+    Threaded HTTP server of the tiles rendered by a `TileRenderer`.
+    '''
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, address, renderer, verbose=False):
+        super().__init__(address, TileRequestHandler)
+        self.renderer = renderer
+        self.verbose = verbose
+
+def serve(P, host='127.0.0.1', port=8000, verbose=False, **kwargs):
+    '''
+    Serve the tiles of a Newton-Raphson fractal until interrupted.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    host : str, default='127.0.0.1'
+        Address to listen on.
+    port : int, default=8000
+        Port to listen on.
+    verbose : bool, default=False
+        Log every request.
+    **kwargs
+        Passed to `TileRenderer`.
+    '''
+    with TileRenderer(P, **kwargs) as renderer:
+        with TileServer((host, port), renderer, verbose=verbose) as server:
+            print(f'Serving on http://{host}:{port}/')
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
@@ -0,0 +1,121 @@
+import numpy as np
+
+
+class BasinStats():
+
+    def __init__(self, n_roots, n_steps, n_scales=8):
+        '''
+        Initialize accumulators of the statistics of a render, which are
+        updated block by block with the root indices and iteration
+        counts while the render is computed, so the statistics of large
+        (e.g. tiled) renders are available without a second pass.
+
+        The accumulated statistics are the number of pixels in the basin
+        of every root, the histogram of the iteration counts and the
+        number of boxes on the boundaries of the basins at a series of
+        box sizes, from which the box-counting dimension of the boundary
+        is estimated.
+
+        Parameters:
+        -----------
+        n_roots : int
+            Number of roots of the polynomial. Pixels with the index
+            `n_roots` are counted as not converged.
+        n_steps : int
+            Maximum number of iterations of the render.
+        n_scales : int
+            Number of box sizes, which are `2, 4, ..., 2**n_scales`
+            pixels. Blocks of the render have to be aligned to the
+            largest box size for the box counts to be exact.
+        '''
+        self.n_roots = n_roots
+        self.n_steps = n_steps
+        self.scales = 2**np.arange(1, n_scales+1)
+        self.counts = np.zeros(n_roots + 1, dtype=np.int64)
+        self.n_iter_hist = np.zeros(n_steps + 1, dtype=np.int64)
+        self.boxes = np.zeros(n_scales, dtype=np.int64)
+        self.boundary_boxes = np.zeros(n_scales, dtype=np.int64)
+
+    def update(self, idx, n_iter=None):
+        '''
+        Add a block of the render to the statistics.
+
+        Parameters:
+        -----------
+        idx : np.ndarray
+            Root index of every pixel of the block with shape `(h, w)`.
+        n_iter : np.ndarray, optional
+            Number of iterations taken by every pixel of the block.
+        '''
+        self.counts += np.bincount(idx.ravel(), minlength=self.counts.size)
+        if n_iter is not None:
+            self.n_iter_hist += np.bincount(np.ravel(n_iter),
+                                            minlength=self.n_iter_hist.size)
+
+        # A box is on a boundary, if it contains pixels of different
+        # basins. The extremes of the indices in the boxes of every size
+        # are reduced from the ones of the previous size.
+        lo, hi = idx, idx
+        for i in range(self.scales.size):
+            lo, hi = self._halve(lo, np.minimum), self._halve(hi, np.maximum)
+            self.boxes[i] += lo.size
+            self.boundary_boxes[i] += np.count_nonzero(lo != hi)
+
+    @staticmethod
+    def _halve(a, ufunc):
+        a = ufunc.reduceat(a, np.arange(0, a.shape[0], 2), axis=0)
+        return ufunc.reduceat(a, np.arange(0, a.shape[1], 2), axis=1)
+
+    def merge(self, other):
+        '''
+        Add the statistics accumulated by another instance, e.g. by a
+        different worker process.
+        '''
+        self.counts += other.counts
+        self.n_iter_hist += other.n_iter_hist
+        self.boxes += other.boxes
+        self.boundary_boxes += other.boundary_boxes
+        return self
+
+    @property
+    def n_pixels(self):
+        return int(self.counts.sum())
+
+    def fractions(self):
+        '''
+        Area fraction of the basin of every root, with the fraction of
+        the not converged pixels last.
+        '''
+        return self.counts / max(self.n_pixels, 1)
+
+    def dimension(self):
+        '''
+        Estimate the box-counting dimension of the boundaries of the
+        basins, as the slope of the number of boundary boxes against the
+        inverse box size on a log-log scale.
+
+        Returns
+        -------
+        float
+            The estimated dimension, or NaN if less than two box sizes
+            contain any boundary.
+        '''
+        mask = self.boundary_boxes > 0
+        if mask.sum() < 2:
+            return np.nan
+        return -np.polyfit(np.log(self.scales[mask]),
+                           np.log(self.boundary_boxes[mask]), 1)[0]
+
+    def to_dict(self):
+        '''
+        Get the statistics as a JSON serializable dictionary.
+        '''
+        return {
+            'n_pixels' : self.n_pixels,
+            'counts' : self.counts.tolist(),
+            'fractions' : self.fractions().tolist(),
+            'n_iter_hist' : self.n_iter_hist.tolist(),
+            'scales' : self.scales.tolist(),
+            'boundary_boxes' : self.boundary_boxes.tolist(),
+            'dimension' : float(self.dimension()),
+        }
@@ -0,0 +1,119 @@
+import numpy as np
+
+from .newton import get_grid_axes, nr_palette, nr_render
+from .instrument import NULL_PROFILER
+from .ddouble import (nr_precision, get_grid_axes_dd, get_starting_grid_dd,
+                      nr_render_dd)
+
+
+def nr_image_axes(N, grid_lim_x, grid_lim_y, precision='auto'):
+    '''
+    Get the coordinate axes of the pixels of an image, with the first
+    row corresponding to the upper limit of `grid_lim_y`.
+
+    Returns
+    -------
+    axes : tuple
+        The `(x, y)` coordinate axes, in float64 or double-double.
+    shape : tuple
+        The `(Ny, Nx)` shape of the image.
+    precision : str
+        The resolved precision, either `'float64'` or `'dd'`.
+    h : float or None
+        Pixel spacing, for the double-double iteration.
+    '''
+    if precision == 'auto':
+        precision = nr_precision(N, grid_lim_x, grid_lim_y)
+    if precision == 'dd':
+        (x, y), h = get_grid_axes_dd(N, grid_lim_x, grid_lim_y[::-1])
+        return (x, y), (y[0].size, x[0].size), precision, h
+    # Limits given as strings or Decimals for deep zooms
+    grid_lim_x = tuple(float(l) for l in grid_lim_x)
+    grid_lim_y = tuple(float(l) for l in grid_lim_y)
+    x, y = get_grid_axes(N, grid_lim_x, grid_lim_y[::-1])
+    return (x, y), (y.size, x.size), precision, None
+
+def nr_render_block(P, axes, precision, h, rows, cols, n_steps, lut,
+                    tol=None, root_tol=None, dd_switch=1e-10, profiler=None,
+                    stats=None):
+    '''
+    Render the block of an image spanned by the `rows` and `cols`
+    slices of its coordinate axes, returned by `nr_image_axes`.
+    '''
+    x, y = axes
+    if precision == 'dd':
+        Z_0 = get_starting_grid_dd(tuple(a[cols] for a in x),
+                                   tuple(a[rows] for a in y))
+        return nr_render_dd(P, Z_0, n_steps, lut,
+                            tol=tol, root_tol=root_tol, h=h,
+                            switch=dd_switch, stats=stats)
+    X_0 = x[None,cols] + 1j*y[rows,None]
+    return nr_render(P, X_0, n_steps, lut, tol=tol, root_tol=root_tol,
+                     profiler=profiler, stats=stats)
+
+def nr_image_tiled(P, N, n_steps, grid_lim_x, grid_lim_y, fname,
+                   tile=1024, cmap='viridis',
+                   tol=None, n_shades=1, root_tol=None, precision='auto',
+                   dd_switch=1e-10, profiler=None, stats=None):
+    '''
+    Render a Newton-Raphson fractal tile by tile into a memory-mapped
+    uint8 RGBA image, so the peak memory usage only depends on the tile
+    size and not on the size of the image. The result is identical to
+    the one of `newton.newton.nr_image` called with the same arguments.
+
+    Parameters
+    ----------
+    P : newton.polynomial.Polynomial
+        A polynomial instance to apply the Newton-Raphson iterative
+        method on.
+    N : int
+        Approximate number of pixels along the shorter side of the image.
+    n_steps : int
+        Number of Newton-Raphson iterations to take.
+    grid_lim_x, grid_lim_y : tuple
+        Limits of the rendered area along the real and imaginary axes.
+    fname : str
+        Path of the `.npy` file to write the image into.
+    tile : int, default=1024
+        Size of the square tiles the image is rendered in.
+    cmap : str or `~matplotlib.colors.Colormap`, default 'viridis'
+        Colormap to color the basins of the roots with.
+    tol, n_shades, root_tol, precision, dd_switch : optional
+        See `newton.newton.nr_image`.
+    profiler : newton.instrument.Profiler, optional
+        If given, the stages of every tile are recorded into it, under a
+        `'tile'` stage carrying the `rows` and `cols` of the tile.
+    stats : newton.stats.BasinStats, optional
+        If given, the statistics of the basins are accumulated into it
+        tile by tile. `tile` has to be a multiple of its largest box
+        size.
+
+    Returns
+    -------
+    np.memmap
+        Memory-mapped array of shape `(Ny, Nx, 4)` backed by `fname`.
+    '''
+    if (stats is not None) and (tile % stats.scales[-1] != 0):
+        raise ValueError(f'Tile size {tile} is not a multiple of the largest box size {stats.scales[-1]}.')
+
+    prof = profiler or NULL_PROFILER
+    with prof.stage('nr_image_tiled'):
+        lut = nr_palette(len(P.roots()), cmap=cmap, n_shades=n_shades)
+        axes, (Ny, Nx), precision, h = nr_image_axes(N, grid_lim_x, grid_lim_y,
+                                                     precision)
+        img = np.lib.format.open_memmap(fname, mode='w+', dtype=np.uint8,
+                                        shape=(Ny, Nx, 4))
+
+        for r in range(0, Ny, tile):
+            for c in range(0, Nx, tile):
+                with prof.stage('tile', rows=(r, min(r+tile, Ny)),
+                                cols=(c, min(c+tile, Nx))):
+                    img[r:r+tile,c:c+tile] = nr_render_block(
+                        P, axes, precision, h, slice(r, r+tile),
+                        slice(c, c+tile), n_steps, lut,
+                        tol=tol, root_tol=root_tol, dd_switch=dd_switch,
+                        profiler=profiler, stats=stats)
+        with prof.stage('flush'):
+            img.flush()
+
+    return img
@@ -1,57 +1,65 @@
 import os
 import sys
-import numpy as np
 from tqdm import tqdm
-from joblib import Parallel, delayed
 
-import matplotlib.pyplot as plt
+from newton.polynomial import Polynomial
+from newton.newton import (NR_fractal_get_frames,
+                           NR_fractal_get_grid_lims,
+                           NR_fractal_get_steps)
+from newton.anim import nr_frames, nr_write_video
+from newton.png import write_png
 
-from polynomial import Polynomial
 
-from newton_engine import (get_NR_colors,
-                           NR_fractal_get_frames,
-                           NR_fractal_get_grid_lims)
-from newton_plots import NR_fractal_mx
+def save_frames(frames, outdir):
+  '''
+  Write every frame into a PNG file, while passing them through.
+  '''
+  for i, frame in enumerate(frames):
+    fname = 'nrfractal_anim_frame-{:04d}.png'.format(i)
+    write_png(outdir + fname, frame)
+    yield frame
 
-def create_frame(i, P,
-                 N, n_steps, gl,
-                 outdir, ffmt, fdpi):
-  X_n, _, _, _= NR_fractal_mx(P,
-                              N=N, n_steps=n_steps,
-                              grid_lim_x=gl[0],
-                              grid_lim_y=gl[1])
-  X = get_NR_colors(P, X_n).reshape((N, N, 4))
+if __name__ == '__main__':
 
-  fname = 'nrfractal_anim_frame-{:04d}.'.format(i)
-  plt.imsave(fname=(outdir + fname + ffmt),
-             arr=X, vmin=0, vmax=1,
-             dpi=fdpi)
+  USAGE = 'USAGE: python newton_anim.py <N> <n_steps> <n_frames> <n_jobs> [--png] [--no-video]'
+  args = [a for a in sys.argv[1:] if not a.startswith('--')]
+  flags = [a for a in sys.argv[1:] if a.startswith('--')]
+  assert len(args) == 4, USAGE
+  assert set(flags) <= {'--png', '--no-video'}, USAGE
+
+  N = int(args[0])
+  n_steps = int(args[1])
+  n_frames = int(args[2])
+  n_jobs = int(args[3])
+  png = '--png' in flags
+  video = '--no-video' not in flags
 
-if __name__ == '__main__':
-  
-  assert len(sys.argv) == 5, 'USAGE: python newton_anim.py <N> <n_steps> <n_frames> <n_jobs>'
-  
-  N = int(sys.argv[1])
-  n_steps = int(sys.argv[2])
-  n_frames = int(sys.argv[3])
-  n_jobs = int(sys.argv[4])
-  ffmt = 'png'
-  fdpi = 100
-  
   outdir = './out/frames-N{}-ns{}/'.format(N, n_steps)
   if not os.path.exists(outdir):
       os.makedirs(outdir)
-  
-  P = Polynomial(c=[1,0,0,1,-1,1])
-  
+
+  P = Polynomial(coeff=[1,0,0,1,-1,1])
+
   # Predefined limits
   gl_s = ((-1.5,1.5),(-1.5,1.5))
   gl_e = ((-1.0092734515,-1.0092734495), (0.1473217440, 0.1473217460))
-  
-  v_coords = NR_fractal_get_frames(gl_s, gl_e, n_frames=n_frames)
+
+  v_coords = NR_fractal_get_frames(gl_s, gl_e, n=n_frames, geometric=True)
   grid_lims = NR_fractal_get_grid_lims(v_coords)
   del v_coords
-  
-  _ = Parallel(n_jobs=n_jobs)(delayed(create_frame)(i, P,
-                                                    N, n_steps, gl,
-                                                    outdir, ffmt, fdpi) for i, gl in enumerate(tqdm(grid_lims)))
+
+  # Iteration budget grows with the zoom depth, starting from `n_steps`
+  frame_steps = NR_fractal_get_steps(grid_lims, n_min=n_steps)
+
+  frames = tqdm(nr_frames(P, grid_lims, N, frame_steps, n_jobs=n_jobs),
+                total=n_frames)
+  if png:
+    frames = save_frames(frames, outdir)
+
+  if video:
+    name = 'NR_fractal-N{}-ns{}'.format(N, n_steps)
+    os.makedirs(outdir + 'anim/', exist_ok=True)
+    nr_write_video(frames, outdir + 'anim/{}.mp4'.format(name))
+  else:
+    for _ in frames:
+      pass
@@ -0,0 +1,155 @@
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from itertools import product
+
+import numpy as np
+
+import matplotlib
+matplotlib.use('Agg')
+
+from newton.polynomial import Polynomial
+from newton.newton import (get_starting_grid, nr_step, nr_iter,
+                           closest_roots, nr_colors)
+from newton.fractal import NR_fractal
+
+
+#
+# Benchmarked hot paths. Every case gets a polynomial, a starting grid
+# and a number of steps, and returns the number of pixel-iterations done
+#
+def bench_nr_step(P, X, n_steps):
+  nr_step(P, X)
+  return X.size
+
+def bench_nr_iter(P, X, n_steps):
+  nr_iter(P, X, n_steps)
+  return X.size * n_steps
+
+def bench_closest_roots(P, X, n_steps):
+  closest_roots(P, X)
+  return X.size
+
+def bench_nr_colors(P, X, n_steps):
+  nr_colors(P, X)
+  return X.size
+
+def bench_NR_fractal(P, X, n_steps):
+  NR_fractal(P, N=X.shape[0], n_steps=n_steps,
+             grid_lim_x=(-1.5,1.5), grid_lim_y=(-1.5,1.5),
+             show=False)
+  return X.size * n_steps
+
+BENCHMARKS = {
+  'nr_step' : bench_nr_step,
+  'nr_iter' : bench_nr_iter,
+  'closest_roots' : bench_closest_roots,
+  'nr_colors' : bench_nr_colors,
+  'NR_fractal' : bench_NR_fractal,
+}
+# Benchmarks doing a single step, whatever the number of steps
+STEPLESS = {'nr_step', 'closest_roots', 'nr_colors'}
+
+
+def run_case(func, N, degree, n_steps, repeat):
+  '''
+  Run a benchmark case and measure its best wall time and peak memory.
+  '''
+  # z^d - 1 has its roots evenly spread on the unit circle
+  P = Polynomial(coeff=[1] + [0]*(degree-1) + [-1])
+  X = get_starting_grid(N, (-1.5,1.5), (-1.5,1.5))
+
+  best = np.inf
+  for _ in range(repeat):
+    t = time.perf_counter()
+    n_pix_iter = func(P, X, n_steps)
+    best = min(best, time.perf_counter() - t)
+
+  # Measure memory in a separate run, as tracing slows down numpy
+  tracemalloc.start()
+  func(P, X, n_steps)
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  return {
+    'time' : best,
+    'throughput' : n_pix_iter / best,
+    'peak_bytes' : peak,
+  }
+
+def compare(results, baseline, tolerance, mem_tolerance):
+  '''
+  Compare the results to a baseline and return the `(case, metric)`
+  pairs of the cases whose throughput dropped by more than `tolerance`,
+  or whose peak memory grew by more than `mem_tolerance`.
+  '''
+  regressions = []
+  for name, r in results.items():
+    if name not in baseline:
+      continue
+    r['ratio'] = r['throughput'] / baseline[name]['throughput']
+    r['mem_ratio'] = r['peak_bytes'] / max(baseline[name]['peak_bytes'], 1)
+    if r['ratio'] < 1 - tolerance:
+      regressions.append((name, 'throughput'))
+    if r['mem_ratio'] > 1 + mem_tolerance:
+      regressions.append((name, 'peak_bytes'))
+  return regressions
+
+def cases(benches, Ns, degrees, steps):
+  '''
+  Get the name, benchmark, N, degree and number of steps of every case,
+  without repeating the benchmarks that ignore the number of steps.
+  '''
+  for name, N, d in product(benches, Ns, degrees):
+    if name in STEPLESS:
+      yield f'{name}|N{N}|d{d}', name, N, d, steps[0]
+      continue
+    for ns in steps:
+      yield f'{name}|N{N}|d{d}|ns{ns}', name, N, d, ns
+
+if __name__ == '__main__':
+
+  parser = argparse.ArgumentParser(description='Benchmark the hot paths of the newton package.')
+  parser.add_argument('--bench', nargs='+', default=list(BENCHMARKS),
+                      choices=list(BENCHMARKS))
+  parser.add_argument('--N', nargs='+', type=int, default=[256, 1024, 4096])
+  parser.add_argument('--degree', nargs='+', type=int, default=[5, 10])
+  parser.add_argument('--n_steps', nargs='+', type=int, default=[10, 50])
+  parser.add_argument('--repeat', type=int, default=3)
+  parser.add_argument('--baseline', type=str, default=None,
+                      help='JSON file of a previous run to compare against')
+  parser.add_argument('--tolerance', type=float, default=0.2,
+                      help='Allowed relative loss of throughput')
+  parser.add_argument('--mem_tolerance', type=float, default=0.1,
+                      help='Allowed relative growth of peak memory')
+  parser.add_argument('--save', type=str, default=None,
+                      help='Save the results into a JSON file')
+  args = parser.parse_args()
+
+  results = {}
+  for case, name, N, d, ns in cases(args.bench, args.N, args.degree,
+                                    args.n_steps):
+    results[case] = run_case(BENCHMARKS[name], N, d, ns, args.repeat)
+    r = results[case]
+    print(f'{case:<36} {r["time"]*1e3:10.2f} ms '
+          f'{r["throughput"]/1e6:10.2f} Mpix-it/s '
+          f'{r["peak_bytes"]/2**20:10.1f} MiB', flush=True)
+
+  regressions = []
+  if args.baseline is not None:
+    with open(args.baseline) as f:
+      baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance,
+                          args.mem_tolerance)
+    for case, metric in regressions:
+      ratio = results[case]['ratio' if metric == 'throughput' else 'mem_ratio']
+      print(f'REGRESSION {case}: {ratio:.2f}x of baseline {metric}',
+            file=sys.stderr)
+
+  if args.save is not None:
+    with open(args.save, 'w') as f:
+      json.dump(results, f, indent=2)
+
+  sys.exit(1 if regressions else 0)
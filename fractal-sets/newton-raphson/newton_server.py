@@ -0,0 +1,20 @@
+import sys
+
+from newton.polynomial import Polynomial
+from newton.server import serve
+
+
+if __name__ == '__main__':
+
+  USAGE = 'USAGE: python newton_server.py <port> <n_jobs> [n_steps]'
+  assert len(sys.argv) in (3, 4), USAGE
+
+  port = int(sys.argv[1])
+  n_jobs = int(sys.argv[2])
+  n_steps = int(sys.argv[3]) if len(sys.argv) == 4 else 20
+
+  # Same polynomial as the one of the animation in `newton_anim.py`
+  P = Polynomial(coeff=[1,0,0,1,-1,1])
+
+  serve(P, port=port, n_jobs=n_jobs, n_steps=n_steps,
+        extent=((-1.5,1.5),(-1.5,1.5)))
@@ -0,0 +1,13 @@
+import numpy as np
+
+from newton.batch import poly_family, batch_roots
+
+
+def test_batch_roots_continuous():
+    # The roots of a family keep their indices along the family
+    C = poly_family([1,0,0,1,-1,1], 4, np.linspace(-3, 3, 41))
+    R = batch_roots(C)
+    assert np.abs(np.diff(R, axis=0)).max() < 0.2
+
+    R_0 = batch_roots(C, match=False)
+    assert np.allclose(np.sort_complex(R), np.sort_complex(R_0))
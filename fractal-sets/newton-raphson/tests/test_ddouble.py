@@ -0,0 +1,13 @@
+import numpy as np
+
+from newton.polynomial import Polynomial
+from newton.ddouble import nr_basins_dd
+
+
+def test_nr_basins_dd_late_switch():
+    # Real points never converge to the roots of z^2 + 1, and a tiny
+    # separation makes them switch to float64 after more than 255 steps
+    x, zero = np.linspace(0.1, 0.9, 50), np.zeros(50)
+    _, n_iter = nr_basins_dd(Polynomial(coeff=[1,0,1]), ((x, zero), (zero, zero)),
+                             N=700, tol=1e-12, h=1e-160)
+    assert np.all(n_iter == 700)
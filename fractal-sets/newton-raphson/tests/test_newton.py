@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from newton.polynomial import Polynomial
+from newton.newton import (get_starting_grid, nr_basins, nr_method, nr_iter,
+                           nr_converge)
+
+
+@pytest.mark.parametrize('method', ['newton', 'halley', 'householder3',
+                                    'householder4'])
+@pytest.mark.parametrize('degree', [3, 5])
+def test_basins_symmetric(method, degree):
+    # The basins of z^d - 1 are symmetric to the real axis, so complex
+    # conjugate roots get the same number of pixels
+    P = Polynomial(coeff=[1] + [0]*(degree-1) + [-1])
+    X = get_starting_grid(120, (-1.5,1.5), (-1.5,1.5))
+    idx, _ = nr_basins(P, X, 30, method=method)
+    counts = np.bincount(idx.ravel(), minlength=degree)
+
+    roots = P.roots()
+    conj = np.argmin(np.abs(roots[:,None] - roots.conj()[None,:]), axis=1)
+    assert np.array_equal(counts, counts[conj])
+
+@pytest.mark.parametrize('method', ['householder0', 'householder', 'foo'])
+def test_unknown_method(method):
+    with pytest.raises(ValueError):
+        nr_method(method)
+
+def test_nr_iter_array_like():
+    P = Polynomial(coeff=[1,0,0,-1])
+    X = nr_iter(P, [0.3, 0.5j], 3)
+    assert np.allclose(X, nr_iter(P, np.array([0.3, 0.5j]), 3))
+    assert np.isclose(nr_iter(P, 0.3, 3), nr_iter(P, np.array([0.3]), 3)[0])
+
+def test_nr_converge_array_like():
+    P = Polynomial(coeff=[1,0,0,-1])
+    X, n_iter = nr_converge(P, [0.3, 0.5j], 30)
+    X_a, n_iter_a = nr_converge(P, np.array([0.3, 0.5j]), 30)
+    assert np.allclose(X, X_a) and np.array_equal(n_iter, n_iter_a)
+
+def test_negative_derivative_order():
+    P = Polynomial(coeff=[1,0,0,-1])
+    for f in (P.derivative, lambda n: P.evald(0.5, n),
+              lambda n: P.evaln(0.5, n), P.__strd__):
+        with pytest.raises(ValueError):
+            f(-1)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from newton.polynomial import Polynomial
+from newton.newton import nr_grid_basins
+from newton.quadtree import nr_basins_quadtree
+
+
+P = Polynomial(coeff=[1,0,0,1,-1,1])
+LIMS = ((-1.5,1.5), (-1.5,1.5))
+
+
+@pytest.mark.parametrize('N', [100, 130, 516, 530])
+@pytest.mark.parametrize('tol', [None, 1e-8])
+def test_quadtree_exact(N, tol):
+    # Sizes that are not multiples of the block size leave narrow strips
+    # of blocks at the edges of the image
+    idx, n_iter = nr_basins_quadtree(P, N, 30, *LIMS, tol=tol)
+    idx_e, n_iter_e = nr_basins_quadtree(P, N, 30, *LIMS, tol=tol, exact=True)
+    assert idx.shape == idx_e.shape
+    assert np.mean(idx != idx_e) < 1e-4
+    if tol is None:
+        assert n_iter is None
+    else:
+        assert np.mean(n_iter != n_iter_e) < 1e-4
+
+def test_quadtree_grid_basins():
+    idx, _ = nr_grid_basins(P, 130, 30, *LIMS, quadtree=True)
+    idx_e, _ = nr_grid_basins(P, 130, 30, *LIMS)
+    assert np.mean(idx != idx_e) < 1e-4
+
+    # With a tolerance every pixel is iterated
+    idx, n_iter = nr_grid_basins(P, 130, 30, *LIMS, tol=1e-8, quadtree=True)
+    idx_e, n_iter_e = nr_grid_basins(P, 130, 30, *LIMS, tol=1e-8)
+    assert np.array_equal(idx, idx_e)
+    assert np.array_equal(n_iter, n_iter_e)
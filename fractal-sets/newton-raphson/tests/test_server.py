@@ -0,0 +1,18 @@
+import struct
+
+from newton.polynomial import Polynomial
+from newton.newton import nr_palette
+from newton.server import _worker_init, _worker_tile
+
+
+P = Polynomial(coeff=[1,0,0,1,-1,1])
+
+
+def test_tiles_are_square_for_any_extent():
+    lut = nr_palette(len(P.roots()))
+    steps = {'n_min' : 5, 'n_per_decade' : 0, 'n_max' : None}
+    for extent in (((-2, 2), (-1, 1)), ((-1, 1), (-2, 2))):
+        _worker_init(P, lut, 1e-10, None, extent, 64, steps)
+        png = _worker_tile(1, 0, 1)
+        # Width and height in the IHDR chunk
+        assert struct.unpack('>II', png[16:24]) == (64, 64)
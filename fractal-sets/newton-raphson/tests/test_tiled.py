@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+import numpy as np
+
+from newton.polynomial import Polynomial
+from newton.newton import nr_image
+from newton.tiled import nr_image_tiled
+
+
+P = Polynomial(coeff=[1,0,0,1,-1,1])
+
+
+def test_limits_as_strings_and_decimals(tmp_path):
+    # Shallow views given in the deep zoom notation resolve to float64
+    img = nr_image(P, 50, 20, (-1.5,1.5), (-1.5,1.5))
+    lims = (('-1.5','1.5'), (Decimal('-1.5'),Decimal('1.5')))
+    assert np.array_equal(img, nr_image(P, 50, 20, *lims))
+    assert np.array_equal(img, nr_image_tiled(P, 50, 20, *lims,
+                                              str(tmp_path / 'img.npy'), tile=16))
+
+def test_tiled_dd_switch(tmp_path):
+    # A deep zoom near a basin boundary, where the switch to float64
+    # changes a few pixels
+    c = (Decimal('0.3'), Decimal('0.6422679288892139'))
+    w = Decimal('2.5e-15')
+    lims = ((c[0] - w/2, c[0] + w/2), (c[1] - w/2, c[1] + w/2))
+    for dd_switch in (1e-10, 1e-13):
+        img = nr_image(P, 64, 60, *lims, dd_switch=dd_switch)
+        tiled = nr_image_tiled(P, 64, 60, *lims, str(tmp_path / 'img.npy'),
+                               tile=16, dd_switch=dd_switch)
+        assert np.array_equal(img, tiled)